@@ -0,0 +1,351 @@
+"""
+Module for publishing the changes made to hotel data as an ordered feed.
+
+Every change event is appended to a JSON Lines file with an increasing
+sequence number, so consumers can resume reading after the last sequence
+they processed. Consumer offsets are stored in a JSON file next to the log,
+with the byte position following the committed event, so polling reads only
+the part of the log after it.
+Subscribers registered in the same process are called as events are
+published; a subscriber that raises is counted and does not affect the
+write that was already committed, or the other subscribers.
+
+Libraries:
+- fcntl: Provides the file locks serializing the writers of a log and of
+the offsets.
+- json: Provides functions for reading and writing JSON data.
+- os: Provides functions for interacting with the operating system.
+- tempfile: Provides the temporary file the offsets are written to.
+- time: Provides the timestamps of the events.
+- reservation_index: Provides the ReservationIndex class for applying
+reservation changes.
+
+Classes:
+- ChangeFeed: A file-backed, resumable log of change events.
+
+Functions:
+- apply_change: Applies a change event to a copy of the hotel data.
+"""
+import fcntl
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from reservation_index import ReservationIndex
+
+HOTEL_CREATED = 'hotel_created'
+HOTEL_DELETED = 'hotel_deleted'
+HOTEL_MODIFIED = 'hotel_modified'
+CUSTOMER_CREATED = 'customer_created'
+CUSTOMER_DELETED = 'customer_deleted'
+CUSTOMER_MODIFIED = 'customer_modified'
+RESERVATION_CREATED = 'reservation_created'
+RESERVATION_CANCELLED = 'reservation_cancelled'
+
+
+class ChangeFeed:
+    """
+    A class to append change events to a log file and deliver them to
+    subscribers and consumers.
+
+    Any number of ChangeFeed instances, in any process, may publish to the
+    same log file: each sequence number is taken from the last logged event
+    while holding an exclusive lock on the file.
+
+    Attributes:
+    - filename (str): The filename of the JSON Lines event log. Defaults to
+    'changes.jsonl'.
+    - offsets_filename (str): The filename storing the consumer offsets.
+    - sequence (int): The sequence number of the last event published or
+    found in the log.
+    - callback_errors (int): The number of subscriber calls that raised.
+
+    Methods:
+    - publish: Appends an event to the log and notifies subscribers.
+    - subscribe: Registers a callback for published events.
+    - unsubscribe: Removes a previously registered callback.
+    - read: Iterates over the logged events after a sequence number.
+    - read_from: Reads the logged events after a byte position.
+    - poll: Returns the events a consumer has not committed yet.
+    - commit: Stores the last sequence number processed by a consumer, with
+    its position in the log.
+    - offset: Returns the last sequence number committed by a consumer.
+    """
+    def __init__(self, filename: str = 'changes.jsonl'):
+        """
+        Initializes a ChangeFeed object, resuming the sequence numbers of an
+        existing log file from its last event without reading the rest of
+        it.
+
+        Parameters:
+        - filename (str, optional): The filename of the event log. Defaults
+        to 'changes.jsonl'.
+        """
+        self.filename = filename
+        self.offsets_filename = filename + '.offsets'
+        self._subscribers: List[Callable[[dict], None]] = []
+        self._polled: dict = {}
+        self.sequence = 0
+        self.callback_errors = 0
+        if os.path.exists(filename):
+            with open(filename, 'rb') as file:
+                self.sequence = _last_sequence(file)
+
+    def publish(self, kind: str, hotel_name: str, **data) -> dict:
+        """
+        Appends an event to the log and notifies the subscribers. The event
+        is logged before any subscriber is called, so a subscriber that
+        raises is counted in callback_errors instead of failing the change.
+
+        Parameters:
+        - kind (str): The kind of change, e.g. RESERVATION_CREATED.
+        - hotel_name (str): The name of the hotel the change applies to.
+        - data: The details of the change.
+
+        Returns:
+        The published event.
+        """
+        with open(self.filename, 'ab+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                self.sequence = _last_sequence(file) + 1
+                event = {
+                    'sequence': self.sequence,
+                    'timestamp': time.time(),
+                    'kind': kind,
+                    'hotel_name': hotel_name,
+                    'data': data
+                }
+                file.write(json.dumps(event).encode('UTF-8') + b'\n')
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception:  # pylint: disable=broad-except
+                self.callback_errors += 1
+        return event
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        """
+        Registers a callback that is called with every published event.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict], None]):
+        """
+        Removes a previously registered callback.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def read(self, after: int = 0) -> Iterator[dict]:
+        """
+        Iterates over the logged events whose sequence number is greater
+        than the given one.
+        """
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', encoding='UTF-8') as file:
+            for line in file:
+                # A line without its newline is still being written
+                if not line.endswith('\n'):
+                    return
+                event = json.loads(line)
+                if event['sequence'] > after:
+                    yield event
+
+    def read_from(self, position: int = 0) -> Tuple[list, int]:
+        """
+        Reads the complete events logged after a byte position of the log
+        file, so a follower can tail the log without re-reading it.
+
+        Parameters:
+        - position (int, optional): The byte position to start reading at.
+        Defaults to 0.
+
+        Returns:
+        A tuple with the list of events and the byte position following the
+        last complete event.
+        """
+        events = []
+        if not os.path.exists(self.filename):
+            return events, position
+        with open(self.filename, 'rb') as file:
+            file.seek(position)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                events.append(json.loads(line))
+                position += len(line)
+        return events, position
+
+    def poll(self, consumer: str, limit: Optional[int] = None) -> list:
+        """
+        Returns the events after the consumer's committed offset, reading
+        the log from the byte position stored with the offset and stopping
+        once limit events are found.
+
+        Parameters:
+        - consumer (str): The name of the consumer.
+        - limit (int, optional): The maximum number of events to return.
+
+        Returns:
+        A list of events in sequence order.
+        """
+        stored = self._read_offsets().get(consumer, {})
+        after = stored.get('sequence', 0)
+        position = stored.get('position', 0)
+        events = []
+        # The byte position following each returned event, for commit
+        positions = {}
+        if os.path.exists(self.filename):
+            with open(self.filename, 'rb') as file:
+                file.seek(position)
+                for line in file:
+                    if limit is not None and len(events) >= limit:
+                        break
+                    # A line without its newline is still being written
+                    if not line.endswith(b'\n'):
+                        break
+                    position += len(line)
+                    event = json.loads(line)
+                    if event['sequence'] > after:
+                        events.append(event)
+                        positions[event['sequence']] = position
+        self._polled[consumer] = positions
+        return events
+
+    def commit(self, consumer: str, sequence: int):
+        """
+        Stores the last sequence number processed by a consumer, with the
+        byte position following that event in the log when the event was
+        returned by poll. The offsets file is updated under an exclusive
+        lock and replaced atomically, so concurrent commits are not lost.
+        """
+        with open(self.offsets_filename + '.lock', 'a',
+                  encoding='UTF-8') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                offsets = self._read_offsets()
+                stored = offsets.get(consumer, {})
+                position = self._polled.get(consumer, {}).get(sequence)
+                if position is None:
+                    # The stored position is still before every event
+                    # after sequence, unless the consumer moves backwards
+                    position = (stored.get('position', 0)
+                                if stored.get('sequence', 0) <= sequence
+                                else 0)
+                offsets[consumer] = {'sequence': sequence,
+                                     'position': position}
+                self._write_offsets(offsets)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def offset(self, consumer: str) -> int:
+        """
+        Returns the last sequence number committed by a consumer, or 0 if it
+        has not committed any.
+        """
+        return self._read_offsets().get(consumer, {}).get('sequence', 0)
+
+    def _read_offsets(self) -> dict:
+        """
+        Reads the consumer offsets from the JSON file. Offsets stored as a
+        bare sequence number have no byte position and are read from the
+        start of the log.
+        """
+        if not os.path.exists(self.offsets_filename):
+            return {}
+        with open(self.offsets_filename, 'r', encoding='UTF-8') as file:
+            offsets = json.load(file)
+        return {consumer: (offset if isinstance(offset, dict)
+                           else {'sequence': offset, 'position': 0})
+                for consumer, offset in offsets.items()}
+
+    def _write_offsets(self, offsets: dict):
+        """
+        Replaces the offsets file with the given offsets, by writing them to
+        a temporary file in the same directory first.
+        """
+        directory, basename = os.path.split(
+            os.path.abspath(self.offsets_filename))
+        descriptor, temporary_filename = tempfile.mkstemp(
+            prefix=basename + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w', encoding='UTF-8') as file:
+                json.dump(offsets, file, indent=4)
+            os.replace(temporary_filename, self.offsets_filename)
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+
+
+def _last_sequence(file, block_size: int = 4096) -> int:
+    """
+    Returns the sequence number of the last complete event of an open log
+    file, reading it backwards from the end, or 0 if the log is empty.
+    """
+    position = file.seek(0, os.SEEK_END)
+    tail = b''
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        file.seek(position)
+        tail = file.read(size) + tail
+        # The last item is an unterminated line, or empty
+        lines = tail.split(b'\n')[:-1]
+        if len(lines) > 1 or (lines and position == 0):
+            return json.loads(lines[-1])['sequence']
+    return 0
+
+
+def apply_change(hotels_data: list, event: dict):
+    """
+    Applies a change event to a list of hotel entries in place.
+
+    Parameters:
+    - hotels_data (list): The hotel entries, as stored in the JSON file.
+    - event (dict): The event to apply.
+    """
+    kind = event['kind']
+    data = event['data']
+    if kind == HOTEL_CREATED:
+        hotels_data.append(data['hotel'])
+        return
+    hotel = next((hotel_data for hotel_data in hotels_data
+                  if hotel_data['name'] == event['hotel_name']), None)
+    if hotel is None:
+        return
+    customers = hotel['customers']
+    if kind == HOTEL_DELETED:
+        hotels_data.remove(hotel)
+    elif kind == HOTEL_MODIFIED:
+        if data['name']:
+            hotel['name'] = data['name']
+        if data['location']:
+            hotel['location'] = data['location']
+    elif kind == CUSTOMER_CREATED:
+        customers.append(data['customer'])
+    elif kind == CUSTOMER_DELETED:
+        for customer in customers:
+            if customer['customer_name'] == data['customer_name']:
+                customers.remove(customer)
+                break
+    elif kind == CUSTOMER_MODIFIED:
+        for customer in customers:
+            if customer['customer_name'] == data['customer_name']:
+                customer['customer_name'] = data['new_customer_name']
+                break
+    elif kind == RESERVATION_CREATED:
+        reservation = data['reservation']
+        hotel['reservation_counter'] = max(
+            hotel.get('reservation_counter', 0), reservation['id'])
+        hotel['rooms'][reservation['room_type']] -= 1
+        ReservationIndex(hotel).add(reservation)
+    elif kind == RESERVATION_CANCELLED:
+        if ReservationIndex(hotel).remove(data['reservation_id']):
+            hotel['rooms'][data['room_type']] += 1
@@ -0,0 +1,178 @@
+"""
+This module contains the tests for the ChangeFeed class.
+"""
+import json
+import sys
+import threading
+import unittest
+from change_feed import ChangeFeed, apply_change
+from customer import Customer
+from hotel import Hotel
+from reservation import Reservation
+from reservation_index import public_view
+from testing_utils import TemporaryDirectoryTestCase
+
+
+class TestChangeFeed(TemporaryDirectoryTestCase):
+    """
+    A class to test publishing, reading and applying change events.
+    """
+
+    def setUp(self):
+        """
+        Sets up a temporary directory for the data and the event log.
+        """
+        super().setUp()
+        self.hotel_filename = self.path('hotels.json')
+        self.feed = ChangeFeed(self.path('changes.jsonl'))
+
+    def test_sequence_resumes_from_log(self):
+        """
+        Tests that a new feed on an existing log continues its sequence.
+        """
+        self.feed.publish('hotel_deleted', 'Test Hotel')
+        self.feed.publish('hotel_deleted', 'Other Hotel')
+        feed = ChangeFeed(self.feed.filename)
+        self.assertEqual(feed.publish('hotel_deleted', 'Test')['sequence'], 3)
+
+    def test_feeds_sharing_a_log_issue_distinct_sequences(self):
+        """
+        Tests that two feeds on the same log never reuse a sequence number.
+        """
+        other = ChangeFeed(self.feed.filename)
+        self.feed.publish('hotel_deleted', 'Test Hotel')
+        other.publish('hotel_deleted', 'Other Hotel')
+        self.assertEqual([event['sequence'] for event in self.feed.read()],
+                         [1, 2])
+
+    def test_subscribers_receive_events(self):
+        """
+        Tests that subscribers are called until they unsubscribe.
+        """
+        received = []
+        self.feed.subscribe(received.append)
+        self.feed.publish('hotel_deleted', 'Test Hotel')
+        self.feed.unsubscribe(received.append)
+        self.feed.publish('hotel_deleted', 'Other Hotel')
+        self.assertEqual([event['hotel_name'] for event in received],
+                         ['Test Hotel'])
+
+    def test_failing_subscriber_does_not_fail_the_write(self):
+        """
+        Tests that a subscriber raising after a reservation is saved is
+        counted without failing the reservation or the other subscribers.
+        """
+        def fail(_event):
+            raise RuntimeError('subscriber failed')
+
+        received = []
+        self.feed.subscribe(fail)
+        self.feed.subscribe(received.append)
+        hotel = Hotel(self.hotel_filename, self.feed)
+        hotel.create_hotel('Test Hotel', 'City Center', {'single': 5})
+        result = hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        self.assertEqual(result, 'single room reserved for Jane Smith')
+        self.assertEqual(len(hotel.display_hotel_info('Test Hotel')
+                             ['reservations']), 1)
+        self.assertEqual(len(received), 3)
+        self.assertEqual(self.feed.callback_errors, 3)
+
+    def test_poll_resumes_from_committed_offset(self):
+        """
+        Tests that a consumer only sees events after its committed offset.
+        """
+        for name in ('A', 'B', 'C'):
+            self.feed.publish('hotel_deleted', name)
+        events = self.feed.poll('search-cache', limit=2)
+        self.assertEqual([event['hotel_name'] for event in events],
+                         ['A', 'B'])
+        self.feed.commit('search-cache', events[-1]['sequence'])
+        events = self.feed.poll('search-cache')
+        self.assertEqual([event['hotel_name'] for event in events], ['C'])
+        self.assertEqual(self.feed.poll('channel-manager')[0]['hotel_name'],
+                         'A')
+
+    def test_poll_starts_at_committed_position(self):
+        """
+        Tests that polling after a commit does not read the log before the
+        committed event.
+        """
+        for name in ('A', 'B', 'C'):
+            self.feed.publish('hotel_deleted', name)
+        events = self.feed.poll('search-cache', limit=2)
+        self.feed.commit('search-cache', events[-1]['sequence'])
+        # Replace the committed events with bytes that are not JSON
+        with open(self.feed.filename, 'r+b') as file:
+            committed = len(file.readline()) + len(file.readline())
+            file.seek(0)
+            file.write(b'x' * (committed - 1) + b'\n')
+        events = ChangeFeed(self.feed.filename).poll('search-cache')
+        self.assertEqual([event['hotel_name'] for event in events], ['C'])
+
+    def test_poll_reads_legacy_offsets(self):
+        """
+        Tests that an offset stored as a bare sequence number still works.
+        """
+        for name in ('A', 'B'):
+            self.feed.publish('hotel_deleted', name)
+        with open(self.feed.offsets_filename, 'w', encoding='UTF-8') as file:
+            json.dump({'search-cache': 1}, file)
+        self.assertEqual(self.feed.offset('search-cache'), 1)
+        events = self.feed.poll('search-cache')
+        self.assertEqual([event['hotel_name'] for event in events], ['B'])
+
+    def test_concurrent_commits_are_kept(self):
+        """
+        Tests that consumers committing at the same time do not overwrite
+        each other's offsets.
+        """
+        self.feed.publish('hotel_deleted', 'A')
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+
+        def commit(consumer):
+            feed = ChangeFeed(self.feed.filename)
+            for _ in range(20):
+                feed.commit(consumer, 1)
+
+        threads = [threading.Thread(target=commit, args=(f'consumer-{n}',))
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([self.feed.offset(f'consumer-{n}')
+                          for n in range(8)], [1] * 8)
+
+    def test_applying_events_reproduces_data(self):
+        """
+        Tests that replaying the events of every mutating method rebuilds
+        the stored hotel data.
+        """
+        hotel = Hotel(self.hotel_filename, self.feed)
+        customer = Customer(self.hotel_filename, self.feed)
+        reservation = Reservation(self.hotel_filename, self.feed)
+        hotel.create_hotel('Test Hotel', 'City Center', {'single': 5})
+        hotel.create_hotel('Old Hotel', 'Downtown', {'single': 1})
+        customer.create_customer('Test Hotel', 'Jane Smith')
+        customer.create_customer('Test Hotel', 'John Doe')
+        customer.modify_customer_info('Test Hotel', 'John Doe', 'John Smith')
+        reservation.create_reservation('Test Hotel', 'Jane Smith',
+                                       '2024-02-20')
+        hotel.reserve_room('Test Hotel', 'Emma Davis', '2024-02-21')
+        reservation.cancel_reservation('Test Hotel', 'Jane Smith')
+        hotel.cancel_reservation_by_id('Test Hotel', 2)
+        customer.delete_customer('Test Hotel', 'John Smith')
+        hotel.modify_hotel_info('Test Hotel', new_location='Uptown')
+        hotel.delete_hotel('Old Hotel')
+
+        replayed = []
+        for event in self.feed.read():
+            apply_change(replayed, event)
+        self.assertEqual([public_view(hotel) for hotel in replayed],
+                         reservation.load_data())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,19 +4,32 @@ Module for managing customer information within hotels.
 Uses JSON file for data storage.
 
 Libraries:
-- json: Provides functions for reading and writing JSON data.
 - Hotel: Class for managing hotel information and reservations.
+- change_feed: Provides the ChangeFeed class for publishing changes.
+- json_handler: Provides the JSONDataHandler class for loading single
+hotels.
+- paged_store: Provides the PagedStore class for paging hotels in on demand.
+- query: Provides the paginated customer queries.
 """
-import json
+from typing import Optional
 
+import change_feed
+from change_feed import ChangeFeed
+from json_handler import JSONDataHandler, exclusive
+from paged_store import PagedStore
+from query import DEFAULT_LIMIT, customers_page
 
-class Customer:
+
+class Customer(JSONDataHandler):
     """
     A class to represent a customer and manage customer-related operations
     within hotels.
 
     Attributes:
     - hotel_filename (str): The filename for storing hotel data in JSON format.
+    - feed (ChangeFeed): The feed changes are published to, if any.
+    - store (PagedStore): The paged store used instead of the JSON file, if
+    any.
 
     Methods:
     - create_customer: Creates a new customer for a specified hotel.
@@ -25,10 +38,15 @@ class Customer:
     in a specified hotel.
     - modify_customer_info: Modifies the name of a specified customer in a
     specified hotel.
+    - query_customers: Returns a page of the customers of a specified hotel.
     """
-    def __init__(self, hotel_filename: str = 'hotels.json'):
+    def __init__(self, hotel_filename: str = 'hotels.json',
+                 feed: Optional[ChangeFeed] = None,
+                 store: Optional[PagedStore] = None):
+        super().__init__(hotel_filename, store, feed)
         self.hotel_filename = hotel_filename
 
+    @exclusive
     def create_customer(self, hotel_name: str, customer_name: str):
         """
         Creates a new customer for the specified hotel.
@@ -41,22 +59,23 @@ class Customer:
             str: A message indicating whether the customer
                 was created successfully or not.
         """
-        with open(self.hotel_filename, 'r', encoding='UTF-8') as file:
-            hotels_data = json.load(file)
-
-        for hotel_data in hotels_data:
-            if hotel_data['name'] == hotel_name:
-                customers = hotel_data['customers']
-                customer_id = len(customers) + 1
-                customers.append({'customer_id': customer_id,
-                                  'customer_name': customer_name})
-                with open(self.hotel_filename, 'w', encoding='UTF-8') as file:
-                    json.dump(hotels_data, file, indent=4)
-                return f'Customer {customer_name} created for {hotel_name}'
+        hotels_data, hotel_data = self.load_hotel(hotel_name)
+
+        if hotel_data:
+            customers = hotel_data['customers']
+            customer_id = len(customers) + 1
+            customer = {'customer_id': customer_id,
+                        'customer_name': customer_name}
+            customers.append(customer)
+            self.save_hotel(hotels_data, hotel_data)
+            self._publish(change_feed.CUSTOMER_CREATED, hotel_name,
+                          customer=customer)
+            return f'Customer {customer_name} created for {hotel_name}'
 
         return (f'Customer {customer_name} not created. '
                 f'Hotel {hotel_name} not found')
 
+    @exclusive
     def delete_customer(self, hotel_name: str, customer_name: str):
         """
         Deletes a customer from the specified hotel.
@@ -69,19 +88,17 @@ class Customer:
             str: A message indicating whether the customer was deleted
                 successfully or not.
         """
-        with open(self.hotel_filename, 'r', encoding='UTF-8') as file:
-            hotels_data = json.load(file)
-
-        for hotel_data in hotels_data:
-            if hotel_data['name'] == hotel_name:
-                customers = hotel_data['customers']
-                for customer in customers:
-                    if customer['customer_name'] == customer_name:
-                        customers.remove(customer)
-                        with open(self.hotel_filename, 'w',
-                                  encoding='UTF-8') as file:
-                            json.dump(hotels_data, file, indent=4)
-                        return f'Customer {customer_name} deleted'
+        hotels_data, hotel_data = self.load_hotel(hotel_name)
+
+        if hotel_data:
+            customers = hotel_data['customers']
+            for customer in customers:
+                if customer['customer_name'] == customer_name:
+                    customers.remove(customer)
+                    self.save_hotel(hotels_data, hotel_data)
+                    self._publish(change_feed.CUSTOMER_DELETED, hotel_name,
+                                  customer_name=customer_name)
+                    return f'Customer {customer_name} deleted'
 
         return f'Customer {customer_name} not found in {hotel_name}'
 
@@ -98,18 +115,16 @@ class Customer:
                 otherwise a message indicating the customer
             was not found.
         """
-        with open(self.hotel_filename, 'r', encoding='UTF-8') as file:
-            hotels_data = json.load(file)
+        _, hotel_data = self.load_hotel(hotel_name)
 
-        for hotel_data in hotels_data:
-            if hotel_data['name'] == hotel_name:
-                customers = hotel_data['customers']
-                for customer in customers:
-                    if customer['customer_name'] == customer_name:
-                        return customer
+        if hotel_data:
+            for customer in hotel_data['customers']:
+                if customer['customer_name'] == customer_name:
+                    return customer
 
         return f'Customer {customer_name} not found in {hotel_name}'
 
+    @exclusive
     def modify_customer_info(self,
                              hotel_name: str,
                              customer_name: str,
@@ -126,20 +141,46 @@ class Customer:
             str: A message indicating whether the customer's name was
                 updated successfully or not.
         """
-        with open(self.hotel_filename, 'r', encoding='UTF-8') as file:
-            hotels_data = json.load(file)
-
-        for hotel_data in hotels_data:
-            if hotel_data['name'] == hotel_name:
-                customers = hotel_data['customers']
-                for customer in customers:
-                    if customer['customer_name'] == customer_name:
-                        customer['customer_name'] = new_customer_name
-                        with open(self.hotel_filename, 'w',
-                                  encoding='UTF-8') as file:
-                            json.dump(hotels_data, file, indent=4)
-                        return (f'Customer name updated from '
-                                f'{customer_name} to '
-                                f'{new_customer_name}')
+        hotels_data, hotel_data = self.load_hotel(hotel_name)
+
+        if hotel_data:
+            for customer in hotel_data['customers']:
+                if customer['customer_name'] == customer_name:
+                    customer['customer_name'] = new_customer_name
+                    self.save_hotel(hotels_data, hotel_data)
+                    self._publish(change_feed.CUSTOMER_MODIFIED, hotel_name,
+                                  customer_name=customer_name,
+                                  new_customer_name=new_customer_name)
+                    return (f'Customer name updated from '
+                            f'{customer_name} to '
+                            f'{new_customer_name}')
 
         return f'Customer {customer_name} not found in {hotel_name}'
+
+    def query_customers(self, hotel_name: str, prefix: str = '',
+                        limit: int = DEFAULT_LIMIT,
+                        cursor: Optional[list] = None):
+        """
+        Returns a page of the customers of the specified hotel whose name
+        starts with a prefix, ordered by name and ID.
+
+        Args:
+            hotel_name (str): The name of the hotel.
+            prefix (str): The prefix of the customer names.
+            limit (int): The maximum number of customers in the page.
+            cursor (list): The next_cursor of the previous page.
+
+        Returns:
+            dict: The 'customers' of the page and the 'next_cursor' to get
+                the next page, which is None on the last page, or a
+                message indicating the limit is invalid or the hotel was
+                not found.
+        """
+        if limit < 1:
+            return 'Limit must be at least 1'
+        _, hotel_data = self.load_hotel(hotel_name)
+
+        if hotel_data:
+            return customers_page(hotel_data, prefix, limit, cursor)
+
+        return f'Hotel {hotel_name} not found'
@@ -6,25 +6,47 @@ Uses JSON file for data storage.
 Libraries:
 - json: Provides functions for reading and writing JSON data.
 - os: Provides functions for interacting with the operating system.
+- reservation_index: Provides the ReservationIndex class for looking up
+reservations by ID.
+- change_feed: Provides the ChangeFeed class for publishing changes.
+- inventory: Provides the SharedInventory class and InventoryMixin for
+claiming rooms.
+- json_handler: Provides the JSONDataHandler class for loading single
+hotels.
+- paged_store: Provides the PagedStore class for paging hotels in on demand.
+- query: Provides the paginated reservation queries.
 """
 import json
 import os
-from typing import Dict
+from typing import Dict, Optional
 
+import change_feed
+from change_feed import ChangeFeed
+from inventory import InventoryMixin, SharedInventory
+from json_handler import JSONDataHandler, exclusive
+from paged_store import PagedStore
+from query import DEFAULT_LIMIT, reservations_page
+from reservation_index import ReservationIndex, public_view
 
-class Hotel:
+
+class Hotel(JSONDataHandler, InventoryMixin):
     """
     A class to represent a hotel and manage its information and reservations.
     """
 
-    _reservation_counter = 0
-
-    def __init__(self, filename: str = 'hotels.json'):
+    def __init__(self, filename: str = 'hotels.json',
+                 feed: Optional[ChangeFeed] = None,
+                 inventory: Optional[SharedInventory] = None,
+                 store: Optional[PagedStore] = None):
         """
-        Initializes a Hotel object with the specified hotel data filename.
+        Initializes a Hotel object with the specified hotel data filename,
+        an optional feed to publish changes to, an optional shared
+        inventory to claim rooms from and an optional paged store used
+        instead of the JSON file.
         """
-        self.filename = (filename if filename.endswith('.json')
-                         else filename + '.json')
+        super().__init__(filename if filename.endswith('.json')
+                         else filename + '.json', store, feed)
+        self.inventory = inventory
 
     def _read_hotels_data(self) -> list:
         """
@@ -37,11 +59,23 @@ class Hotel:
 
     def _write_hotels_data(self, data: list):
         """
-        Writes hotel data to the JSON file.
+        Atomically replaces the JSON file with the hotel data.
+        """
+        super().save_data(data)
+
+    def load_data(self) -> list:
+        """
+        Loads hotel data, treating a missing JSON file as no hotels.
         """
-        with open(self.filename, 'w', encoding='UTF-8') as file:
-            json.dump(data, file, indent=4)
+        return self._read_hotels_data()
 
+    def save_data(self, data: list):
+        """
+        Saves hotel data to the JSON file.
+        """
+        self._write_hotels_data(data)
+
+    @exclusive
     def create_hotel(self,
                      name: str,
                      location: str,
@@ -49,8 +83,12 @@ class Hotel:
         """
         Creates a new hotel entry in the JSON file.
         """
-        hotels_data = self._read_hotels_data()
-        hotel_id = len(hotels_data) + 1
+        if self.store is not None:
+            hotels_data = []
+            hotel_id = len(self.store) + 1
+        else:
+            hotels_data = self.load_data()
+            hotel_id = len(hotels_data) + 1
         hotel_info = {
             'hotel_id': hotel_id,
             'name': name,
@@ -59,37 +97,64 @@ class Hotel:
             'reservations': [],
             'customers': []
         }
-        hotels_data.append(hotel_info)
-        self._write_hotels_data(hotels_data)
+        if self.store is not None:
+            if not self.store.add_hotel(hotel_info):
+                return 'Hotel already exists'
+        else:
+            hotels_data.append(hotel_info)
+            self._write_hotels_data(hotels_data)
+        self._publish(change_feed.HOTEL_CREATED, name, hotel=hotel_info)
         return 'Hotel created'
 
+    @exclusive
     def get_customer_id(self, hotel_name: str, customer_name: str) -> int:
         """
         Retrieves the ID of a customer from the hotel's customer list.
         """
-        hotels_data = self._read_hotels_data()
-        for hotel in hotels_data:
-            if hotel['name'] == hotel_name:
-                customers = hotel['customers']
-                for customer in customers:
-                    if customer['customer_name'] == customer_name:
-                        return customer['customer_id']
-                customer_id = len(customers) + 1
-                customers.append({'customer_id': customer_id,
-                                  'customer_name': customer_name})
-                self._write_hotels_data(hotels_data)
-                return customer_id
+        hotels_data, hotel = self.load_hotel(hotel_name)
+        if hotel:
+            customer_count = len(hotel['customers'])
+            customer_id = self._get_or_add_customer(hotel, customer_name)
+            if len(hotel['customers']) != customer_count:
+                self.save_hotel(hotels_data, hotel)
+                self._publish(change_feed.CUSTOMER_CREATED, hotel_name,
+                              customer=hotel['customers'][-1])
+            return customer_id
         return -1
 
+    @staticmethod
+    def _get_or_add_customer(hotel: dict, customer_name: str) -> int:
+        """
+        Returns the ID of a customer in a hotel entry, adding the customer
+        to the entry if needed.
+        """
+        customers = hotel['customers']
+        for customer in customers:
+            if customer['customer_name'] == customer_name:
+                return customer['customer_id']
+        customer_id = len(customers) + 1
+        customers.append({'customer_id': customer_id,
+                          'customer_name': customer_name})
+        return customer_id
+
+    @exclusive
     def delete_hotel(self, hotel_name: str) -> str:
         """
         Deletes a hotel entry from the JSON file.
         """
+        if self.store is not None:
+            if not self.store.delete_hotel(hotel_name):
+                return 'Hotel not found'
+            self._invalidate_rooms(hotel_name)
+            self._publish(change_feed.HOTEL_DELETED, hotel_name)
+            return 'Hotel deleted'
         hotels_data = self._read_hotels_data()
         for hotel in hotels_data:
             if hotel['name'] == hotel_name:
                 hotels_data.remove(hotel)
                 self._write_hotels_data(hotels_data)
+                self._invalidate_rooms(hotel_name)
+                self._publish(change_feed.HOTEL_DELETED, hotel_name)
                 return 'Hotel deleted'
         return 'Hotel not found'
 
@@ -97,33 +162,62 @@ class Hotel:
         """
         Finds a hotel by its name.
         """
-        hotels_data = self._read_hotels_data()
-        for hotel in hotels_data:
-            if hotel['name'] == hotel_name:
-                return hotel
-        return {}
+        return self.load_hotel(hotel_name)[1]
 
     def display_hotel_info(self, hotel_name: str) -> dict:
         """
         Displays information about a specific hotel.
         """
         hotel = self._find_hotel_by_name(hotel_name)
-        return hotel if hotel else 'Hotel not found'
+        return public_view(hotel) if hotel else 'Hotel not found'
 
+    def query_reservations(self, hotel_name: str,
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           room_type: Optional[str] = None,
+                           customer_name: Optional[str] = None,
+                           limit: int = DEFAULT_LIMIT,
+                           cursor: Optional[int] = None):
+        """
+        Returns a page of the reservations of a specific hotel, in ID order,
+        optionally filtered by an inclusive date range, room type and
+        customer. Pass the returned next_cursor to get the next page.
+        """
+        if limit < 1:
+            return 'Limit must be at least 1'
+        hotel = self._find_hotel_by_name(hotel_name)
+        if not hotel:
+            return 'Hotel not found'
+        return reservations_page(hotel, limit, cursor,
+                                 start_date=start_date, end_date=end_date,
+                                 room_type=room_type,
+                                 customer_name=customer_name)
+
+    @exclusive
     def modify_hotel_info(self,
                           hotel_name: str,
                           new_name: str = '',
                           new_location: str = '') -> str:
         """
-        Modifies information about a specific hotel.
+        Modifies information about a specific hotel. A hotel cannot be
+        renamed to the name of another hotel.
         """
-        hotel = self._find_hotel_by_name(hotel_name)
+        hotels_data, hotel = self.load_hotel(hotel_name)
         if hotel:
+            if new_name and new_name != hotel_name and (
+                    new_name in self.store if self.store is not None
+                    else any(other['name'] == new_name
+                             for other in hotels_data)):
+                return 'Hotel already exists'
             if new_name:
                 hotel['name'] = new_name
             if new_location:
                 hotel['location'] = new_location
-            self._write_hotels_data(self._read_hotels_data())
+            self.save_hotel(hotels_data, hotel, hotel_name)
+            if hotel['name'] != hotel_name:
+                self._invalidate_rooms(hotel_name)
+            self._publish(change_feed.HOTEL_MODIFIED, hotel_name,
+                          name=new_name, location=new_location)
             return 'Hotel information modified'
         return 'Hotel not found'
 
@@ -132,45 +226,97 @@ class Hotel:
                      reservation_date: str,
                      room_type: str = 'single') -> str:
         """
-        Reserves a room in a specific hotel for a customer.
+        Reserves a room in a specific hotel for a customer. A room tracked
+        by the shared inventory is claimed before the data file is locked,
+        so a sold out room type is rejected without file I/O.
         """
-        hotel = self._find_hotel_by_name(hotel_name)
         if not isinstance(customer_name, str):
             return 'Invalid customer name.'
+        remaining = self._claim_room(hotel_name, room_type)
+        if remaining is not None and remaining < 0:
+            return f'No {room_type} rooms available'
+        return self._reserve_claimed_room(hotel_name, customer_name,
+                                          reservation_date, room_type,
+                                          remaining)
+
+    @exclusive
+    def _reserve_claimed_room(self, hotel_name: str, customer_name: str,
+                              reservation_date: str, room_type: str,
+                              remaining: Optional[int]) -> str:
+        """
+        Saves a reservation for a room claimed from the shared inventory,
+        or counted in the data file if remaining is None.
+        """
+        remaining = self._confirm_claim(hotel_name, room_type, remaining)
+        hotels_data, hotel = self.load_hotel(hotel_name)
         if hotel:
-            customer_id = self.get_customer_id(hotel_name, customer_name)
-            if customer_id == -1:
-                return 'Customer not found or could not be created'
+            customer_count = len(hotel['customers'])
+            customer_id = self._get_or_add_customer(hotel, customer_name)
             rooms = hotel['rooms']
+            if remaining is not None:
+                # The shared inventory is authoritative for the room count
+                rooms[room_type] = remaining + 1
             if room_type in rooms and rooms[room_type] > 0:
-                self._reservation_counter += 1
-                reservation_id = self._reservation_counter
+                index = ReservationIndex(hotel)
+                reservation_id = index.next_id()
                 rooms[room_type] -= 1
-                hotel['reservations'].append({
+                reservation = {
                     'id': reservation_id,
                     'customer_id': customer_id,
                     'customer_name': customer_name,
                     'room_type': room_type,
                     'date': reservation_date
-                })
-                self._write_hotels_data(self._read_hotels_data())
+                }
+                index.add(reservation)
+                self.save_hotel(hotels_data, hotel)
+                if len(hotel['customers']) != customer_count:
+                    self._publish(change_feed.CUSTOMER_CREATED, hotel_name,
+                                  customer=hotel['customers'][-1])
+                self._publish(change_feed.RESERVATION_CREATED, hotel_name,
+                              reservation=reservation)
                 return f'{room_type} room reserved for {customer_name}'
             return f'No {room_type} rooms available'
+        self._give_back_claim(hotel_name, room_type, remaining)
         return f'Hotel {hotel_name} not found'
 
+    @exclusive
     def cancel_reservation(self, hotel_name: str, customer_name: str) -> str:
         """
-        Cancels a reservation for a customer in a specific hotel.
+        Cancels the first reservation of a customer in a specific hotel.
         """
-        hotel = self._find_hotel_by_name(hotel_name)
+        hotels_data, hotel = self.load_hotel(hotel_name)
         if hotel:
-            reservations = hotel['reservations']
-            for reservation in reservations:
-                if reservation['customer_name'] == customer_name:
-                    room_type = reservation['room_type']
-                    hotel['rooms'][room_type] += 1
-                    reservations.remove(reservation)
-                    self._write_hotels_data(self._read_hotels_data())
-                    return f'Reservation canceled for {customer_name}'
+            index = ReservationIndex(hotel)
+            reservation = index.find_by_customer(customer_name)
+            if reservation:
+                index.remove(reservation['id'])
+                self._return_room(hotel_name, hotel, reservation['room_type'])
+                self.save_hotel(hotels_data, hotel)
+                self._publish(change_feed.RESERVATION_CANCELLED, hotel_name,
+                              reservation_id=reservation['id'],
+                              room_type=reservation['room_type'])
+                return f'Reservation canceled for {customer_name}'
             return f'No reservation found for {customer_name}'
         return f'Hotel {hotel_name} not found'
+
+    @exclusive
+    def cancel_reservation_by_id(self, hotel_name: str,
+                                 reservation_id: int) -> str:
+        """
+        Cancels a reservation by its ID in a specific hotel. The latency
+        still grows with the number of reservations: the JSON file is parsed
+        and rewritten whole, and a paged store copies the hotel's
+        reservation list and index.
+        """
+        hotels_data, hotel = self.load_hotel(hotel_name)
+        if hotel:
+            reservation = ReservationIndex(hotel).remove(reservation_id)
+            if reservation:
+                self._return_room(hotel_name, hotel, reservation['room_type'])
+                self.save_hotel(hotels_data, hotel)
+                self._publish(change_feed.RESERVATION_CANCELLED, hotel_name,
+                              reservation_id=reservation_id,
+                              room_type=reservation['room_type'])
+                return f'Reservation {reservation_id} canceled'
+            return f'No reservation {reservation_id} found'
+        return f'Hotel {hotel_name} not found'
@@ -88,6 +88,12 @@ class TestHotelMethods(unittest.TestCase):
         result = hotel.modify_hotel_info("Nonexistent Hotel", new_name="Modified Hotel")
         self.assertEqual(result, 'Hotel not found')
 
+    def test_modify_hotel_info_existing_name(self):
+        hotel = Hotel(self.test_filename)
+        result = hotel.modify_hotel_info("Test Hotel", new_name="Another Hotel")
+        self.assertEqual(result, 'Hotel already exists')
+        self.assertEqual(hotel.display_hotel_info("Another Hotel")['hotel_id'], 2)
+
     def test_reserve_room_existing_hotel_customer_and_available_rooms(self):
         hotel = Hotel(self.test_filename)
         hotel.create_hotel("Test Hotel", "City Center", {"single": 5, "double": 10})
@@ -113,6 +119,28 @@ class TestHotelMethods(unittest.TestCase):
         result = hotel.reserve_room("Test Hotel", "Axel", "2024-03-10", "suit")
         self.assertEqual(result, 'No suit rooms available')
 
+    def test_cancel_reservation_by_id(self):
+        hotel = Hotel(self.test_filename)
+        hotel.reserve_room("Test Hotel", "John Doe", "2024-03-10", "single")
+        hotel.reserve_room("Test Hotel", "John Doe", "2024-03-11", "single")
+        result = hotel.cancel_reservation_by_id("Test Hotel", 2)
+        self.assertEqual(result, 'Reservation 2 canceled')
+        info = hotel.display_hotel_info("Test Hotel")
+        self.assertEqual(info['rooms']['single'], 4)
+        self.assertEqual(len(info['reservations']), 1)
+        self.assertEqual(info['reservations'][0]['date'], "2024-03-10")
+        self.assertNotIn('reservation_index', info)
+        self.assertNotIn('tombstones', info)
+        with open(self.test_filename, 'r', encoding='UTF-8') as file:
+            stored = json.load(file)[0]
+        self.assertEqual([reservation['id'] for reservation in stored['reservations']], [1])
+        self.assertNotIn('reservation_index', stored)
+
+    def test_cancel_reservation_by_id_nonexistent_reservation(self):
+        hotel = Hotel(self.test_filename)
+        result = hotel.cancel_reservation_by_id("Test Hotel", 7)
+        self.assertEqual(result, 'No reservation 7 found')
+
 
 if __name__ == '__main__':
     unittest.main()
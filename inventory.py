@@ -0,0 +1,253 @@
+"""
+Module for sharing the room inventory of hotels between worker processes.
+
+The number of available rooms of every hotel and room type is kept as a
+64-bit counter in a multiprocessing shared memory block, so workers can
+check and claim rooms without reading the hotel data file. Claims are
+compare-and-decrement operations serialized by a lock shared by the
+workers, so a room can never be claimed twice.
+
+Rooms are checked and claimed before the data file lock is taken, so a
+sold out room type is rejected without any file I/O and without waiting for
+other writers. The inventory does not remove file I/O from successful
+reservations: they are still written synchronously, reading and rewriting
+the data file under its lock. Each hotel also has a flag
+that is set when the hotel is renamed or deleted, after which its rooms are
+counted in the data file again.
+
+Libraries:
+- multiprocessing: Provides the shared memory block and the shared lock.
+
+Classes:
+- SharedInventory: Room counters shared between processes.
+- InventoryMixin: Claims and returns rooms through an optional inventory.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+COUNTER_SIZE = 8
+
+
+class SharedInventory:
+    """
+    A class to keep the available rooms of every hotel and room type in
+    shared memory.
+
+    The inventory is created once by the parent process from the hotel data
+    and passed to the worker processes when they are started. Hotels and
+    room types created afterwards are not tracked, nor are hotels that have
+    been invalidated.
+
+    Attributes:
+    - slots (dict): The counter position of each room type of each hotel.
+    - flags (dict): The position of the invalidated flag of each hotel.
+
+    Methods:
+    - create: Creates an inventory from the hotel data.
+    - tracks: Tells whether a hotel's room type has a valid counter.
+    - invalidate: Stops tracking the rooms of a hotel.
+    - available: Returns the number of available rooms.
+    - claim: Claims a room if one is available.
+    - release: Gives a claimed room back.
+    - close: Detaches the process from the shared memory block.
+    - unlink: Frees the shared memory block.
+    """
+    def __init__(self, slots: Dict[str, Dict[str, int]],
+                 flags: Dict[str, int],
+                 memory: shared_memory.SharedMemory, lock):
+        """
+        Initializes a SharedInventory over an existing shared memory block.
+        Use create to allocate a new inventory.
+        """
+        self.slots = slots
+        self.flags = flags
+        self._memory = memory
+        self._lock = lock
+        self._counters = memory.buf[:COUNTER_SIZE * self._size()].cast('q')
+
+    @classmethod
+    def create(cls, hotels_data: list,
+               name: Optional[str] = None) -> 'SharedInventory':
+        """
+        Creates an inventory holding the rooms of the given hotels.
+
+        Parameters:
+        - hotels_data (list): The hotel entries, as stored in the JSON file.
+        - name (str, optional): The name of the shared memory block.
+        Defaults to a generated name.
+        """
+        slots = {}
+        flags = {}
+        counts = []
+        for hotel in hotels_data:
+            if hotel['name'] in slots:
+                continue
+            slots[hotel['name']] = {}
+            for room_type, count in hotel['rooms'].items():
+                slots[hotel['name']][room_type] = len(counts)
+                counts.append(count)
+            flags[hotel['name']] = len(counts)
+            counts.append(0)
+        memory = shared_memory.SharedMemory(
+            name=name, create=True, size=COUNTER_SIZE * max(1, len(counts)))
+        inventory = cls(slots, flags, memory, multiprocessing.Lock())
+        for position, count in enumerate(counts):
+            inventory._counters[position] = count
+        return inventory
+
+    def __getstate__(self) -> dict:
+        return {'slots': self.slots, 'flags': self.flags,
+                'name': self._memory.name, 'lock': self._lock}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['slots'], state['flags'],
+                      shared_memory.SharedMemory(name=state['name']),
+                      state['lock'])
+
+    def _size(self) -> int:
+        return (sum(len(room_types) for room_types in self.slots.values())
+                + len(self.flags))
+
+    def tracks(self, hotel_name: str, room_type: str) -> bool:
+        """
+        Tells whether the inventory has a counter for a hotel's room type
+        and the hotel has not been invalidated.
+        """
+        return (room_type in self.slots.get(hotel_name, {})
+                and not self._counters[self.flags[hotel_name]])
+
+    def invalidate(self, hotel_name: str):
+        """
+        Stops tracking the rooms of a hotel that has been renamed or
+        deleted, in every process. A hotel created again with the same name
+        has its rooms counted in the data file.
+        """
+        if hotel_name in self.flags:
+            with self._lock:
+                self._counters[self.flags[hotel_name]] = 1
+
+    def available(self, hotel_name: str, room_type: str) -> int:
+        """
+        Returns the number of available rooms of a hotel's room type.
+        """
+        return self._counters[self.slots[hotel_name][room_type]]
+
+    def claim(self, hotel_name: str, room_type: str) -> int:
+        """
+        Claims a room of a hotel's room type if one is available.
+
+        Returns:
+        The number of rooms left after the claim, or -1 if there was no
+        room to claim.
+        """
+        position = self.slots[hotel_name][room_type]
+        with self._lock:
+            count = self._counters[position]
+            if count <= 0:
+                return -1
+            self._counters[position] = count - 1
+            return count - 1
+
+    def release(self, hotel_name: str, room_type: str) -> int:
+        """
+        Gives a room of a hotel's room type back.
+
+        Returns:
+        The number of rooms available after the release.
+        """
+        position = self.slots[hotel_name][room_type]
+        with self._lock:
+            self._counters[position] += 1
+            return self._counters[position]
+
+    def close(self):
+        """
+        Detaches the process from the shared memory block.
+        """
+        self._counters.release()
+        self._memory.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory block. Called once, by the creator.
+        """
+        self._memory.unlink()
+
+
+class InventoryMixin:
+    """
+    A mixin for the classes that reserve rooms, claiming them from a shared
+    inventory when one tracks the room type and from the hotel entry
+    otherwise.
+
+    Attributes:
+    - inventory (SharedInventory): The shared inventory rooms are claimed
+    from, if any.
+    """
+    inventory: Optional[SharedInventory] = None
+
+    def _tracks_rooms(self, hotel_name: str, room_type: str) -> bool:
+        """
+        Tells whether the rooms of a hotel's room type are claimed from the
+        shared inventory instead of the JSON file.
+        """
+        return (self.inventory is not None
+                and self.inventory.tracks(hotel_name, room_type))
+
+    def _return_room(self, hotel_name: str, hotel: dict, room_type: str):
+        """
+        Gives a room of a cancelled reservation back.
+        """
+        if self._tracks_rooms(hotel_name, room_type):
+            hotel['rooms'][room_type] = self.inventory.release(hotel_name,
+                                                               room_type)
+        else:
+            hotel['rooms'][room_type] += 1
+
+    def _claim_room(self, hotel_name: str, room_type: str) -> Optional[int]:
+        """
+        Claims a room from the shared inventory, without any file I/O or
+        the data file lock.
+
+        Returns:
+        The number of rooms left after the claim, -1 if there was no room
+        to claim, or None if the room type is counted in the data file.
+        """
+        if self._tracks_rooms(hotel_name, room_type):
+            return self.inventory.claim(hotel_name, room_type)
+        return None
+
+    def _confirm_claim(self, hotel_name: str, room_type: str,
+                       remaining: Optional[int]) -> Optional[int]:
+        """
+        Checks, while holding the data file lock, that a claimed room is
+        still counted in the shared inventory.
+
+        Returns:
+        The number of rooms left now, which is what the data file records,
+        since claims made by other writers meanwhile are saved in any order.
+        None if nothing was claimed, or if the hotel was invalidated since
+        the claim, in which case its rooms are counted in the data file and
+        the claim is dropped.
+        """
+        if remaining is None or not self._tracks_rooms(hotel_name,
+                                                       room_type):
+            return None
+        return self.inventory.available(hotel_name, room_type)
+
+    def _give_back_claim(self, hotel_name: str, room_type: str,
+                         remaining: Optional[int]):
+        """
+        Gives back a claimed room that was not reserved.
+        """
+        if remaining is not None:
+            self.inventory.release(hotel_name, room_type)
+
+    def _invalidate_rooms(self, hotel_name: str):
+        """
+        Stops claiming the rooms of a renamed or deleted hotel from the
+        shared inventory.
+        """
+        if self.inventory is not None:
+            self.inventory.invalidate(hotel_name)
@@ -0,0 +1,192 @@
+"""
+This module contains the tests for the SharedInventory class.
+"""
+import multiprocessing
+import os
+import unittest
+from customer import Customer
+from hotel import Hotel
+from inventory import SharedInventory
+from reservation import Reservation
+from testing_utils import TemporaryDirectoryTestCase
+
+
+def claim_rooms(inventory, attempts, claims):
+    """
+    Tries to claim a single room of 'Test Hotel' the given number of times,
+    reporting how many claims succeeded.
+    """
+    claimed = 0
+    for _ in range(attempts):
+        if inventory.claim('Test Hotel', 'single') >= 0:
+            claimed += 1
+    claims.put(claimed)
+
+
+def create_reservations(hotel_filename, inventory, attempts, claims):
+    """
+    Tries to reserve a single room of 'Test Hotel' the given number of
+    times through a Reservation, reporting how many reservations were made.
+    """
+    reservation = Reservation(hotel_filename, inventory=inventory)
+    created = 0
+    for day in range(attempts):
+        result = reservation.create_reservation('Test Hotel', 'Jane Smith',
+                                                f'2024-03-{day % 28 + 1:02}')
+        if result.startswith('Reservation for'):
+            created += 1
+    claims.put(created)
+
+
+class TestSharedInventory(TemporaryDirectoryTestCase):
+    """
+    A class to test claiming rooms from the shared inventory.
+    """
+
+    def setUp(self):
+        """
+        Sets up a hotel and an inventory holding its rooms.
+        """
+        super().setUp()
+        self.hotel_filename = self.path('hotels.json')
+        self.hotel = Hotel(self.hotel_filename)
+        self.hotel.create_hotel('Test Hotel', 'City Center',
+                                {'single': 25, 'double': 1})
+        self.inventory = SharedInventory.create(
+            self.hotel._read_hotels_data())
+
+    def tearDown(self):
+        """
+        Frees the shared memory.
+        """
+        self.inventory.close()
+        self.inventory.unlink()
+
+    def test_concurrent_claims_never_oversell(self):
+        """
+        Tests that processes racing for rooms claim each room only once.
+        """
+        claims = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=claim_rooms,
+                                           args=(self.inventory, 50, claims))
+                   for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        total = sum(claims.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join()
+        self.assertEqual(total, 25)
+        self.assertEqual(self.inventory.available('Test Hotel', 'single'), 0)
+
+    def test_concurrent_reservations_are_all_persisted(self):
+        """
+        Tests that processes racing to reserve rooms persist every claimed
+        room and nothing more.
+        """
+        Customer(self.hotel_filename).create_customer('Test Hotel',
+                                                      'Jane Smith')
+        claims = multiprocessing.Queue()
+        workers = [multiprocessing.Process(
+            target=create_reservations,
+            args=(self.hotel_filename, self.inventory, 10, claims))
+            for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        total = sum(claims.get(timeout=60) for _ in workers)
+        for worker in workers:
+            worker.join()
+        hotel = Hotel(self.hotel_filename).load_data()[0]
+        self.assertEqual(total, 25)
+        self.assertEqual(len(hotel['reservations']), 25)
+        self.assertEqual(hotel['rooms']['single'], 0)
+        self.assertEqual(self.inventory.available('Test Hotel', 'single'), 0)
+
+    def test_hotel_rejects_without_reading_file(self):
+        """
+        Tests that a sold out room type is rejected without file I/O, not
+        even to take the data file lock.
+        """
+        hotel = Hotel(self.hotel_filename, inventory=self.inventory)
+        self.assertEqual(hotel.reserve_room('Test Hotel', 'Jane Smith',
+                                            '2024-02-20', 'double'),
+                         'double room reserved for Jane Smith')
+        os.remove(self.hotel_filename)
+        os.remove(self.hotel_filename + '.lock')
+        self.assertEqual(hotel.reserve_room('Test Hotel', 'John Doe',
+                                            '2024-02-21', 'double'),
+                         'No double rooms available')
+        reservation = Reservation(self.hotel_filename,
+                                  inventory=self.inventory)
+        self.assertEqual(reservation.create_reservation(
+            'Test Hotel', 'John Doe', '2024-02-21', 'double'),
+            'No double rooms available')
+        self.assertFalse(os.path.exists(self.hotel_filename + '.lock'))
+
+    def test_reservation_claims_and_releases(self):
+        """
+        Tests that reservations claim rooms and cancellations return them.
+        """
+        Customer(self.hotel_filename).create_customer('Test Hotel',
+                                                      'Jane Smith')
+        reservation = Reservation(self.hotel_filename,
+                                  inventory=self.inventory)
+        reservation.create_reservation('Test Hotel', 'Jane Smith',
+                                       '2024-02-20', 'double')
+        self.assertEqual(self.inventory.available('Test Hotel', 'double'), 0)
+        self.assertEqual(reservation.create_reservation(
+            'Test Hotel', 'Jane Smith', '2024-02-21', 'double'),
+            'No double rooms available')
+        reservation.cancel_reservation('Test Hotel', 'Jane Smith')
+        self.assertEqual(self.inventory.available('Test Hotel', 'double'), 1)
+        self.assertEqual(
+            reservation.load_data()[0]['rooms']['double'], 1)
+
+    def test_untracked_hotels_use_file(self):
+        """
+        Tests that hotels created after the inventory use the file counts.
+        """
+        hotel = Hotel(self.hotel_filename, inventory=self.inventory)
+        hotel.create_hotel('New Hotel', 'Downtown', {'single': 1})
+        self.assertFalse(self.inventory.tracks('New Hotel', 'single'))
+        self.assertEqual(hotel.reserve_room('New Hotel', 'Jane Smith',
+                                            '2024-02-20'),
+                         'single room reserved for Jane Smith')
+
+    def test_renamed_hotel_uses_file(self):
+        """
+        Tests that the counters of a renamed hotel are no longer used.
+        """
+        hotel = Hotel(self.hotel_filename, inventory=self.inventory)
+        hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20',
+                           'double')
+        hotel.modify_hotel_info('Test Hotel', new_name='Renamed Hotel')
+        self.assertFalse(self.inventory.tracks('Test Hotel', 'double'))
+        hotel.create_hotel('Test Hotel', 'Downtown', {'double': 1})
+        self.assertEqual(hotel.reserve_room('Test Hotel', 'John Doe',
+                                            '2024-02-21', 'double'),
+                         'double room reserved for John Doe')
+        self.assertEqual(hotel.cancel_reservation('Renamed Hotel',
+                                                  'Jane Smith'),
+                         'Reservation canceled for Jane Smith')
+        self.assertEqual(
+            hotel.display_hotel_info('Renamed Hotel')['rooms']['double'], 1)
+
+    def test_recreated_hotel_uses_file(self):
+        """
+        Tests that a hotel deleted and created again does not reuse the
+        counters of the deleted one.
+        """
+        hotel = Hotel(self.hotel_filename, inventory=self.inventory)
+        hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20',
+                           'double')
+        hotel.delete_hotel('Test Hotel')
+        hotel.create_hotel('Test Hotel', 'Downtown', {'double': 2})
+        self.assertFalse(self.inventory.tracks('Test Hotel', 'double'))
+        for name in ('John Doe', 'Jane Smith'):
+            self.assertEqual(hotel.reserve_room('Test Hotel', name,
+                                                '2024-02-21', 'double'),
+                             f'double room reserved for {name}')
+
+
+if __name__ == '__main__':
+    unittest.main()
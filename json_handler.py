@@ -1,10 +1,58 @@
 """
 Module for handling JSON data.
 
+The JSON file is always replaced atomically, so readers see either the old
+or the new data, never a partly written file. Read-modify-write methods are
+decorated with exclusive, which holds an exclusive lock on a sidecar lock
+file while they run, so writers in different processes do not lose each
+other's changes.
+
 Libraries:
+- contextlib: Provides the context manager decorator.
+- fcntl: Provides the file lock serializing the writers.
+- functools: Provides the wrapper of the exclusive decorator.
 - json: Provides functions for reading and writing JSON data.
+- os: Provides functions for interacting with the operating system.
+- tempfile: Provides the temporary files written before replacing the data.
+- threading: Provides the per-thread record of the locks held.
+- change_feed: Provides the ChangeFeed class for publishing changes.
+- paged_store: Provides the PagedStore class for paging hotels in on demand.
+- reservation_index: Provides the public view of the hotel entries.
+
+Classes:
+- JSONDataHandler: Loads and saves the hotel data.
+
+Functions:
+- exclusive: Runs a method while holding the data file lock.
 """
+import contextlib
+import fcntl
+import functools
 import json
+import os
+import tempfile
+import threading
+from typing import Iterator, Optional, Tuple
+
+from change_feed import ChangeFeed
+from paged_store import PagedStore
+from reservation_index import public_view
+
+# The lock files held by the current thread, so nested exclusive calls do
+# not try to lock the same file again
+_held_locks = threading.local()
+
+
+def exclusive(method):
+    """
+    Decorates a method of a JSONDataHandler so it runs while holding the
+    exclusive lock of the data file.
+    """
+    @functools.wraps(method)
+    def locked_method(self, *args, **kwargs):
+        with self.locked():
+            return method(self, *args, **kwargs)
+    return locked_method
 
 
 class JSONDataHandler:
@@ -14,20 +62,42 @@ class JSONDataHandler:
     Attributes:
     - filename (str): The filename for storing JSON data. Defaults to
     'hotels.json'.
+    - store (PagedStore): The paged store hotels are read from and written
+    to instead of the JSON file, if any. Its changes are only durable once
+    it is flushed or closed.
+    - feed (ChangeFeed): The feed changes are published to, if any.
 
     Methods:
     - load_data: Loads JSON data from the specified file.
-    - save_data: Saves JSON data to the specified file.
+    - save_data: Atomically replaces the specified file with JSON data.
+    - locked: Holds the exclusive lock of the data file.
+    - load_hotel: Loads a single hotel entry.
+    - save_hotel: Saves a hotel entry loaded with load_hotel.
     """
-    def __init__(self, filename='hotels.json'):
+    def __init__(self, filename='hotels.json',
+                 store: Optional[PagedStore] = None,
+                 feed: Optional[ChangeFeed] = None):
         """
         Initializes a JSONDataHandler object with the specified filename.
 
         Parameters:
         - filename (str, optional): The filename for storing JSON data.
         Defaults to 'hotels.json'.
+        - store (PagedStore, optional): The paged store used instead of the
+        JSON file, which the caller flushes or closes. Defaults to None.
+        - feed (ChangeFeed, optional): The feed changes are published to.
+        Defaults to None.
         """
         self.filename = filename
+        self.store = store
+        self.feed = feed
+
+    def _publish(self, kind: str, hotel_name: str, **data):
+        """
+        Publishes a change event if a change feed is configured.
+        """
+        if self.feed is not None:
+            self.feed.publish(kind, hotel_name, **data)
 
     def load_data(self):
         """
@@ -41,10 +111,85 @@ class JSONDataHandler:
 
     def save_data(self, data):
         """
-        Saves JSON data to the specified file.
+        Saves hotel data to the specified file, by writing it to a temporary
+        file in the same directory and replacing the file with it. Only the
+        public view of each hotel is written, without the reservation index
+        and tombstones.
+
+        Parameters:
+        - data: The hotel data to be saved.
+        """
+        data = [public_view(hotel) for hotel in data]
+        directory, basename = os.path.split(os.path.abspath(self.filename))
+        descriptor, temporary_filename = tempfile.mkstemp(
+            prefix=basename + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w', encoding='UTF-8') as file:
+                json.dump(data, file, indent=4)
+            os.replace(temporary_filename, self.filename)
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Holds an exclusive lock on the data file's lock file, so a
+        read-modify-write is not interleaved with another writer. The lock
+        is not taken again if the thread already holds it. When a paged
+        store is used, the store's lock is held instead, which serializes
+        the threads sharing the store.
+        """
+        if self.store is not None:
+            with self.store.lock:
+                yield
+            return
+        lock_filename = os.path.abspath(self.filename) + '.lock'
+        held = _held_locks.__dict__.setdefault('filenames', set())
+        if lock_filename in held:
+            yield
+            return
+        with open(lock_filename, 'a', encoding='UTF-8') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            held.add(lock_filename)
+            try:
+                yield
+            finally:
+                held.discard(lock_filename)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_hotel(self, hotel_name: str) -> Tuple[list, dict]:
+        """
+        Loads the entry of the first hotel with the specified name.
+
+        Parameters:
+        - hotel_name (str): The name of the hotel.
+
+        Returns:
+        A tuple with the loaded hotel data, to be passed to save_hotel, and
+        the hotel entry, or an empty dict if the hotel was not found. Only
+        the hotel itself is loaded when a paged store is used.
+        """
+        if self.store is not None:
+            return [], self.store.get_hotel(hotel_name)
+        hotels_data = self.load_data()
+        for hotel in hotels_data:
+            if hotel['name'] == hotel_name:
+                return hotels_data, hotel
+        return hotels_data, {}
+
+    def save_hotel(self, hotels_data: list, hotel: dict,
+                   hotel_name: Optional[str] = None):
+        """
+        Saves a hotel entry loaded with load_hotel.
 
         Parameters:
-        - data: The JSON data to be saved.
+        - hotels_data (list): The hotel data returned by load_hotel.
+        - hotel (dict): The changed hotel entry.
+        - hotel_name (str, optional): The name the hotel was loaded with, if
+        it has been renamed.
         """
-        with open(self.filename, 'w', encoding='UTF-8') as file:
-            json.dump(data, file, indent=4)
\ No newline at end of file
+        if self.store is not None:
+            self.store.put_hotel(hotel, hotel_name)
+        else:
+            self.save_data(hotels_data)
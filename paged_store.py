@@ -0,0 +1,332 @@
+"""
+Module for storing hotel data on disk and paging hotels in on demand.
+
+The hotels are stored one JSON document per line in a data file, and an
+index file maps each hotel name to the offset and length of its line. Only
+the hotels being used are loaded, into an LRU cache bounded by a number of
+entries and/or bytes. The cache holds the parsed hotels. get_hotel hands
+out a copy of a hotel's containers, so changes only reach the store through
+put_hotel, and a hotel is only serialized when it is written back, on
+eviction or flush, by appending a new line and pointing the index at it.
+The copy shares the reservation entries, which are never changed in place.
+
+Changes are not durable until the store is flushed or closed: a process
+that exits without doing so loses the changed hotels still in the cache
+and every index update. Use the store as a context manager to close it.
+
+Libraries:
+- functools: Provides the wrapper of the synchronized methods.
+- json: Provides functions for reading and writing JSON data.
+- os: Provides functions for interacting with the operating system.
+- threading: Provides the lock serializing the threads sharing a store.
+- collections: Provides the ordered dict backing the LRU cache.
+
+Classes:
+- PagedStore: An on-disk hotel store with a bounded LRU working set.
+"""
+import functools
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterator, Optional
+
+
+def _copy_hotel(hotel: dict) -> dict:
+    """
+    Returns a copy of a hotel entry with its own containers and customers,
+    sharing the reservation entries, which are never changed in place.
+    """
+    copied = dict(hotel)
+    copied['rooms'] = dict(hotel['rooms'])
+    copied['reservations'] = list(hotel['reservations'])
+    copied['customers'] = [dict(customer) for customer in hotel['customers']]
+    if 'reservation_index' in hotel:
+        copied['reservation_index'] = dict(hotel['reservation_index'])
+    return copied
+
+
+def _synchronized(method):
+    """
+    Decorates a PagedStore method so it runs while holding the store's lock.
+    """
+    @functools.wraps(method)
+    def synchronized_method(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return synchronized_method
+
+
+class PagedStore:
+    """
+    A class to load hotels from disk on demand into a bounded LRU cache.
+
+    Attributes:
+    - filename (str): The filename of the data file. Defaults to
+    'hotels.jsonl'.
+    - index_filename (str): The filename of the offset index.
+    - max_entries (int): The maximum number of cached hotels, if any.
+    - max_bytes (int): The maximum serialized size of the cached hotels, if
+    any.
+    - lock (RLock): The lock held by every store operation, and by the
+    handlers for the whole of a read-modify-write.
+
+    Methods:
+    - from_json: Creates a store from a hotels JSON file.
+    - get_hotel: Returns a copy of a hotel, loading it if needed.
+    - put_hotel: Stores a changed hotel to be written back.
+    - add_hotel: Adds a new hotel.
+    - delete_hotel: Deletes a hotel.
+    - hotel_names: Iterates over the names of the stored hotels.
+    - flush: Writes every changed hotel and the index to disk.
+    - close: Flushes the store.
+    - compact: Rewrites the data file without superseded lines.
+    - stats: Returns the cache statistics.
+    """
+    def __init__(self, filename: str = 'hotels.jsonl',
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Initializes a PagedStore over the specified data file, loading only
+        its offset index.
+
+        Parameters:
+        - filename (str, optional): The filename of the data file. Defaults
+        to 'hotels.jsonl'.
+        - max_entries (int, optional): The maximum number of cached hotels.
+        Defaults to no limit.
+        - max_bytes (int, optional): The maximum serialized size of the
+        cached hotels. Defaults to no limit.
+        """
+        self.filename = filename
+        self.index_filename = filename + '.index'
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self._index = OrderedDict()
+        if os.path.exists(self.index_filename):
+            with open(self.index_filename, 'r', encoding='UTF-8') as file:
+                self._index = OrderedDict(json.load(file))
+        self._cache = OrderedDict()
+        self._sizes = {}
+        self._dirty = set()
+        self._cached_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_json(cls, json_filename: str, filename: str = 'hotels.jsonl',
+                  max_entries: Optional[int] = None,
+                  max_bytes: Optional[int] = None) -> 'PagedStore':
+        """
+        Creates a store holding the hotels of a hotels JSON file.
+        """
+        with open(json_filename, 'r', encoding='UTF-8') as file:
+            hotels_data = json.load(file)
+        for stale in (filename, filename + '.index'):
+            if os.path.exists(stale):
+                os.remove(stale)
+        store = cls(filename, max_entries, max_bytes)
+        for hotel in hotels_data:
+            if hotel['name'] not in store:
+                store._write_back(hotel['name'], hotel)
+        store.flush()
+        return store
+
+    @_synchronized
+    def __len__(self) -> int:
+        return len(self._index) + sum(1 for name in self._cache
+                                      if name not in self._index)
+
+    @_synchronized
+    def __contains__(self, hotel_name: str) -> bool:
+        return hotel_name in self._cache or hotel_name in self._index
+
+    def __enter__(self) -> 'PagedStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def hotel_names(self) -> Iterator[str]:
+        """
+        Iterates over the names of the stored hotels without loading them,
+        as they were when the iteration started.
+        """
+        with self.lock:
+            hotel_names = list(self._index)
+            hotel_names.extend(hotel_name for hotel_name in self._cache
+                               if hotel_name not in self._index)
+        return iter(hotel_names)
+
+    @_synchronized
+    def get_hotel(self, hotel_name: str) -> dict:
+        """
+        Returns a copy of a hotel, loading it into the cache if needed, or
+        an empty dict if it is not stored. Changing the copy does not change
+        the store until it is passed to put_hotel.
+        """
+        if hotel_name in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(hotel_name)
+            return _copy_hotel(self._cache[hotel_name])
+        if hotel_name not in self._index:
+            return {}
+        self._misses += 1
+        offset, length = self._index[hotel_name]
+        with open(self.filename, 'rb') as file:
+            file.seek(offset)
+            hotel = json.loads(file.read(length))
+        self._cache_hotel(hotel_name, hotel, length)
+        return _copy_hotel(hotel)
+
+    @_synchronized
+    def put_hotel(self, hotel: dict,
+                  hotel_name: Optional[str] = None) -> bool:
+        """
+        Stores a changed hotel to be written back. The store keeps the given
+        dict, which the caller must not change afterwards. The hotel is only
+        serialized now when a byte budget is set, to measure it.
+
+        Parameters:
+        - hotel (dict): The changed hotel.
+        - hotel_name (str, optional): The name the hotel was stored under,
+        if it has been renamed. Defaults to the hotel's name.
+
+        Returns:
+        False if the hotel was renamed to the name of another stored hotel,
+        in which case nothing is changed, True otherwise.
+        """
+        if hotel_name and hotel_name != hotel['name']:
+            if hotel['name'] in self:
+                return False
+            self.delete_hotel(hotel_name)
+        self._dirty.add(hotel['name'])
+        size = (len(json.dumps(hotel).encode('UTF-8'))
+                if self.max_bytes is not None
+                else self._sizes.get(hotel['name'], 0))
+        self._cache_hotel(hotel['name'], hotel, size)
+        return True
+
+    @_synchronized
+    def add_hotel(self, hotel: dict) -> bool:
+        """
+        Adds a new hotel, returning False if one with the same name is
+        already stored.
+        """
+        if hotel['name'] in self:
+            return False
+        self.put_hotel(hotel)
+        return True
+
+    @_synchronized
+    def delete_hotel(self, hotel_name: str) -> bool:
+        """
+        Deletes a hotel, returning False if it is not stored.
+        """
+        if hotel_name not in self:
+            return False
+        self._index.pop(hotel_name, None)
+        if hotel_name in self._cache:
+            del self._cache[hotel_name]
+            self._cached_bytes -= self._sizes.pop(hotel_name)
+        self._dirty.discard(hotel_name)
+        return True
+
+    @_synchronized
+    def flush(self):
+        """
+        Writes every changed hotel and the index to disk.
+        """
+        for hotel_name in list(self._dirty):
+            self._write_back(hotel_name, self._cache[hotel_name])
+        self._dirty.clear()
+        with open(self.index_filename, 'w', encoding='UTF-8') as file:
+            json.dump(self._index, file)
+
+    @_synchronized
+    def close(self):
+        """
+        Flushes the store, making every change durable. The store can still
+        be used afterwards.
+        """
+        self.flush()
+
+    @_synchronized
+    def compact(self):
+        """
+        Rewrites the data file keeping only the current line of each hotel.
+        """
+        self.flush()
+        if not os.path.exists(self.filename):
+            return
+        compacted_filename = self.filename + '.compact'
+        index = OrderedDict()
+        with open(self.filename, 'rb') as source, \
+                open(compacted_filename, 'wb') as target:
+            for hotel_name, (offset, length) in self._index.items():
+                source.seek(offset)
+                index[hotel_name] = (target.tell(), length)
+                target.write(source.read(length) + b'\n')
+        os.replace(compacted_filename, self.filename)
+        self._index = index
+        self.flush()
+
+    @_synchronized
+    def stats(self) -> dict:
+        """
+        Returns the hits, misses, hit rate, evictions and size of the cache.
+        The size counts the hotels as they were read, plus, when a byte
+        budget is set, as they were last put.
+        """
+        lookups = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'evictions': self._evictions,
+            'entries': len(self._cache),
+            'bytes': self._cached_bytes
+        }
+
+    def _cache_hotel(self, hotel_name: str, hotel: dict, size: int):
+        """
+        Caches a hotel of the given serialized size as the most recently
+        used entry.
+        """
+        if hotel_name in self._cache:
+            self._cached_bytes -= self._sizes[hotel_name]
+        self._cache[hotel_name] = hotel
+        self._cache.move_to_end(hotel_name)
+        self._sizes[hotel_name] = size
+        self._cached_bytes += size
+        self._evict()
+
+    def _evict(self):
+        """
+        Evicts the least recently used hotels, writing back the changed
+        ones, until the cache is within its limits. The most recently used
+        hotel is always kept.
+        """
+        while len(self._cache) > 1 and (
+                (self.max_entries is not None
+                 and len(self._cache) > self.max_entries)
+                or (self.max_bytes is not None
+                    and self._cached_bytes > self.max_bytes)):
+            hotel_name, hotel = self._cache.popitem(last=False)
+            self._cached_bytes -= self._sizes.pop(hotel_name)
+            if hotel_name in self._dirty:
+                self._dirty.discard(hotel_name)
+                self._write_back(hotel_name, hotel)
+            self._evictions += 1
+
+    def _write_back(self, hotel_name: str, hotel: dict):
+        """
+        Appends a hotel to the data file and points the index at it.
+        """
+        line = json.dumps(hotel).encode('UTF-8')
+        with open(self.filename, 'ab') as file:
+            offset = file.tell()
+            file.write(line + b'\n')
+        self._index[hotel_name] = (offset, len(line))
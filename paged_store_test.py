@@ -0,0 +1,205 @@
+"""
+This module contains the tests for the PagedStore class.
+"""
+import json
+import sys
+import threading
+import unittest
+from customer import Customer
+from hotel import Hotel
+from paged_store import PagedStore
+from reservation import Reservation
+from testing_utils import TemporaryDirectoryTestCase
+
+
+class TestPagedStore(TemporaryDirectoryTestCase):
+    """
+    A class to test paging hotels in and out of a bounded cache.
+    """
+
+    def setUp(self):
+        """
+        Sets up a store holding five hotels.
+        """
+        super().setUp()
+        json_filename = self.path('hotels.json')
+        self.filename = self.path('hotels.jsonl')
+        hotel = Hotel(json_filename)
+        for number in range(5):
+            hotel.create_hotel(f'Hotel {number}', 'City Center',
+                               {'single': 5})
+        self.store = PagedStore.from_json(json_filename, self.filename,
+                                          max_entries=2)
+
+    def test_loads_hotels_on_demand(self):
+        """
+        Tests that hotels are loaded once and then served from the cache.
+        """
+        self.assertEqual(self.store.stats()['entries'], 0)
+        self.assertEqual(self.store.get_hotel('Hotel 3')['hotel_id'], 4)
+        self.assertEqual(self.store.get_hotel('Hotel 3')['hotel_id'], 4)
+        self.assertEqual(self.store.get_hotel('Missing Hotel'), {})
+        stats = self.store.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_cache_is_bounded(self):
+        """
+        Tests that the least recently used hotels are evicted.
+        """
+        for name in ('Hotel 0', 'Hotel 1', 'Hotel 0', 'Hotel 2'):
+            self.store.get_hotel(name)
+        stats = self.store.stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (2, 1))
+        self.store.get_hotel('Hotel 0')
+        self.assertEqual(self.store.stats()['hits'], 2)
+
+    def test_bounded_by_bytes(self):
+        """
+        Tests that a byte budget keeps at most the hotels fitting in it.
+        """
+        store = PagedStore(self.filename, max_bytes=1)
+        store.get_hotel('Hotel 0')
+        store.get_hotel('Hotel 1')
+        self.assertEqual(store.stats()['entries'], 1)
+
+    def test_dirty_hotels_written_back_on_eviction(self):
+        """
+        Tests that a changed hotel survives being evicted.
+        """
+        hotel = self.store.get_hotel('Hotel 0')
+        hotel['location'] = 'Uptown'
+        self.store.put_hotel(hotel)
+        self.store.get_hotel('Hotel 1')
+        self.store.get_hotel('Hotel 2')
+        self.assertEqual(self.store.get_hotel('Hotel 0')['location'],
+                         'Uptown')
+        self.store.flush()
+        reopened = PagedStore(self.filename)
+        self.assertEqual(reopened.get_hotel('Hotel 0')['location'], 'Uptown')
+        self.assertEqual(list(reopened.hotel_names()),
+                         [f'Hotel {number}' for number in range(5)])
+
+    def test_unsaved_changes_do_not_reach_the_cache(self):
+        """
+        Tests that changing a returned hotel without putting it back leaves
+        the store unchanged.
+        """
+        hotel = Hotel(store=self.store)
+        hotel.display_hotel_info('Hotel 0')['location'] = 'Uptown'
+        self.store.get_hotel('Hotel 0')['rooms']['single'] = 0
+        self.assertEqual(hotel.reserve_room('Hotel 0', 'Ghost', '2024-02-20',
+                                            'double'),
+                         'No double rooms available')
+        hotel_data = self.store.get_hotel('Hotel 0')
+        self.assertEqual(hotel_data['location'], 'City Center')
+        self.assertEqual(hotel_data['rooms']['single'], 5)
+        self.assertEqual(hotel_data['customers'], [])
+
+    def test_closing_makes_changes_durable(self):
+        """
+        Tests that leaving the store's context writes the changes to disk.
+        """
+        with PagedStore(self.filename) as store:
+            Hotel(store=store).modify_hotel_info('Hotel 0',
+                                                 new_location='Uptown')
+            self.assertEqual(PagedStore(self.filename)
+                             .get_hotel('Hotel 0')['location'], 'City Center')
+        reopened = PagedStore(self.filename)
+        self.assertEqual(reopened.get_hotel('Hotel 0')['location'], 'Uptown')
+
+    def test_threads_sharing_a_store_keep_every_reservation(self):
+        """
+        Tests that threads reserving through one store lose no update.
+        """
+        store = PagedStore(self.filename)
+
+        def reserve_rooms(number):
+            hotel = Hotel(store=store)
+            for day in range(20):
+                hotel.reserve_room('Hotel 0', f'Guest {number}',
+                                   f'2024-03-{day % 28 + 1:02}')
+
+        hotel = store.get_hotel('Hotel 0')
+        hotel['rooms']['single'] = 1000
+        store.put_hotel(hotel)
+        threads = [threading.Thread(target=reserve_rooms, args=(number,))
+                   for number in range(8)]
+        # Switch threads often so unsynchronized updates would interleave
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        hotel = store.get_hotel('Hotel 0')
+        self.assertEqual(len(hotel['reservations']), 160)
+        self.assertEqual(hotel['rooms']['single'], 840)
+
+    def test_rename_does_not_overwrite_another_hotel(self):
+        """
+        Tests that a hotel cannot be renamed to the name of another one.
+        """
+        hotel = Hotel(store=self.store)
+        self.assertEqual(hotel.modify_hotel_info('Hotel 0',
+                                                 new_name='Hotel 1'),
+                         'Hotel already exists')
+        renamed = self.store.get_hotel('Hotel 0')
+        renamed['name'] = 'Hotel 1'
+        self.assertFalse(self.store.put_hotel(renamed, 'Hotel 0'))
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.get_hotel('Hotel 1')['hotel_id'], 2)
+        self.assertEqual(self.store.get_hotel('Hotel 0')['hotel_id'], 1)
+
+    def test_compact_keeps_current_hotels(self):
+        """
+        Tests that compaction drops superseded lines only.
+        """
+        hotel = self.store.get_hotel('Hotel 0')
+        hotel['location'] = 'Uptown'
+        self.store.put_hotel(hotel)
+        self.store.delete_hotel('Hotel 4')
+        self.store.compact()
+        with open(self.filename, 'r', encoding='UTF-8') as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(len(lines), 4)
+        reopened = PagedStore(self.filename)
+        self.assertEqual(reopened.get_hotel('Hotel 0')['location'], 'Uptown')
+        self.assertEqual(reopened.get_hotel('Hotel 4'), {})
+
+    def test_operations_use_store(self):
+        """
+        Tests that hotel, customer and reservation operations run against
+        the paged store.
+        """
+        hotel = Hotel(store=self.store)
+        customer = Customer(store=self.store)
+        reservation = Reservation(store=self.store)
+        self.assertEqual(hotel.create_hotel('Hotel 5', 'Downtown',
+                                            {'single': 1}), 'Hotel created')
+        self.assertEqual(hotel.create_hotel('Hotel 5', 'Downtown',
+                                            {'single': 1}),
+                         'Hotel already exists')
+        customer.create_customer('Hotel 5', 'Jane Smith')
+        self.assertEqual(reservation.create_reservation(
+            'Hotel 5', 'Jane Smith', '2024-02-20'),
+            'Reservation for Jane Smith created at Hotel 5')
+        hotel.modify_hotel_info('Hotel 5', new_name='Grand Hotel')
+        for number in range(5):
+            hotel.display_hotel_info(f'Hotel {number}')
+        self.store.flush()
+        reopened = PagedStore(self.filename)
+        grand_hotel = reopened.get_hotel('Grand Hotel')
+        self.assertEqual(grand_hotel['hotel_id'], 6)
+        self.assertEqual(grand_hotel['rooms']['single'], 0)
+        self.assertEqual(grand_hotel['reservations'][0]['customer_name'],
+                         'Jane Smith')
+        self.assertEqual(reopened.get_hotel('Hotel 5'), {})
+        self.assertEqual(hotel.delete_hotel('Hotel 5'), 'Hotel not found')
+
+
+if __name__ == '__main__':
+    unittest.main()
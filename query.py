@@ -0,0 +1,128 @@
+"""
+Module for querying the reservations and customers of a hotel page by page.
+
+Results are filtered lazily from the hotel entry and cut to the requested
+page, so only the items of the page are collected. The hotel entry itself
+is still loaded whole before the query runs: with the JSON file the whole
+file is parsed, and with a paged store the hotel's containers are copied.
+Each page carries a cursor, the sort key of its last item, which is passed
+back to fetch the next page.
+
+Libraries:
+- heapq: Provides the bounded selection of the smallest customers.
+- itertools: Provides the slicing of lazily filtered reservations.
+- reservation_index: Provides the ReservationIndex class for resuming after
+a reservation ID.
+
+Functions:
+- iter_reservations: Iterates over filtered reservations in ID order.
+- iter_customers: Iterates over customers whose name has a given prefix.
+- reservations_page: Returns a page of filtered reservations.
+- customers_page: Returns a page of customers ordered by name.
+"""
+import heapq
+import itertools
+from typing import Iterator, Optional
+
+from reservation_index import ReservationIndex
+
+DEFAULT_LIMIT = 50
+
+
+def iter_reservations(hotel: dict,
+                      start_date: Optional[str] = None,
+                      end_date: Optional[str] = None,
+                      room_type: Optional[str] = None,
+                      customer_name: Optional[str] = None,
+                      after: int = 0) -> Iterator[dict]:
+    """
+    Iterates over the live reservations of a hotel in ID order.
+
+    Parameters:
+    - hotel (dict): The hotel entry.
+    - start_date (str, optional): The earliest date, inclusive, in
+    YYYY-MM-DD format.
+    - end_date (str, optional): The latest date, inclusive, in YYYY-MM-DD
+    format.
+    - room_type (str, optional): The room type to keep.
+    - customer_name (str, optional): The customer to keep.
+    - after (int, optional): The ID after which to start. Defaults to 0.
+    """
+    for reservation in ReservationIndex(hotel).live_after(after):
+        if start_date is not None and reservation['date'] < start_date:
+            continue
+        if end_date is not None and reservation['date'] > end_date:
+            continue
+        if room_type is not None and reservation['room_type'] != room_type:
+            continue
+        if (customer_name is not None
+                and reservation['customer_name'] != customer_name):
+            continue
+        yield reservation
+
+
+def _customer_key(customer: dict) -> tuple:
+    return (customer['customer_name'], customer['customer_id'])
+
+
+def iter_customers(hotel: dict, prefix: str = '',
+                   after: Optional[list] = None) -> Iterator[dict]:
+    """
+    Iterates over the customers of a hotel whose name starts with the given
+    prefix and who sort after the given cursor.
+
+    Parameters:
+    - hotel (dict): The hotel entry.
+    - prefix (str, optional): The name prefix. Defaults to ''.
+    - after (list, optional): The [customer_name, customer_id] cursor after
+    which to start.
+    """
+    for customer in hotel['customers']:
+        if not customer['customer_name'].startswith(prefix):
+            continue
+        if after is not None and _customer_key(customer) <= tuple(after):
+            continue
+        yield customer
+
+
+def reservations_page(hotel: dict, limit: int = DEFAULT_LIMIT,
+                      cursor: Optional[int] = None, **filters) -> dict:
+    """
+    Returns a page of the reservations of a hotel matching the filters of
+    iter_reservations, in ID order.
+
+    Returns:
+    A dict with the 'reservations' of the page and the 'next_cursor' to
+    pass to get the next page, which is None on the last page.
+    """
+    matches = iter_reservations(hotel, after=cursor or 0, **filters)
+    reservations = list(itertools.islice(matches, limit + 1))
+    has_more = len(reservations) > limit
+    reservations = reservations[:limit]
+    return {
+        'reservations': reservations,
+        'next_cursor': reservations[-1]['id'] if has_more else None
+    }
+
+
+def customers_page(hotel: dict, prefix: str = '',
+                   limit: int = DEFAULT_LIMIT,
+                   cursor: Optional[list] = None) -> dict:
+    """
+    Returns a page of the customers of a hotel whose name starts with the
+    given prefix, ordered by name and ID.
+
+    Returns:
+    A dict with the 'customers' of the page and the 'next_cursor' to pass
+    to get the next page, which is None on the last page.
+    """
+    customers = heapq.nsmallest(limit + 1,
+                                iter_customers(hotel, prefix, cursor),
+                                key=_customer_key)
+    has_more = len(customers) > limit
+    customers = customers[:limit]
+    return {
+        'customers': customers,
+        'next_cursor': (list(_customer_key(customers[-1])) if has_more
+                        else None)
+    }
@@ -0,0 +1,114 @@
+"""
+This module contains the tests for the paginated reservation and customer
+queries.
+"""
+import unittest
+from customer import Customer
+from hotel import Hotel
+from testing_utils import TemporaryDirectoryTestCase
+
+
+class TestQuery(TemporaryDirectoryTestCase):
+    """
+    A class to test filtering and paging through reservations and customers.
+    """
+
+    def setUp(self):
+        """
+        Sets up a hotel with reservations spread over dates and room types.
+        """
+        super().setUp()
+        hotel_filename = self.path('hotels.json')
+        self.hotel = Hotel(hotel_filename)
+        self.customer = Customer(hotel_filename)
+        self.hotel.create_hotel('Test Hotel', 'City Center',
+                                {'single': 10, 'double': 10})
+        for day in range(1, 10):
+            self.hotel.reserve_room('Test Hotel',
+                                    'Jane Smith' if day % 2 else 'John Doe',
+                                    f'2024-02-0{day}',
+                                    'single' if day % 3 else 'double')
+
+    def test_pages_cover_all_reservations_once(self):
+        """
+        Tests that following the cursors returns every reservation in ID
+        order.
+        """
+        ids = []
+        cursor = None
+        while True:
+            page = self.hotel.query_reservations('Test Hotel', limit=4,
+                                                 cursor=cursor)
+            ids.extend(reservation['id']
+                       for reservation in page['reservations'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(ids, list(range(1, 10)))
+
+    def test_filters(self):
+        """
+        Tests filtering by date range, room type and customer.
+        """
+        page = self.hotel.query_reservations(
+            'Test Hotel', start_date='2024-02-02', end_date='2024-02-07',
+            room_type='single', customer_name='Jane Smith')
+        self.assertEqual([reservation['date']
+                          for reservation in page['reservations']],
+                         ['2024-02-05', '2024-02-07'])
+        self.assertEqual(page['next_cursor'], None)
+
+    def test_cursor_survives_cancellation(self):
+        """
+        Tests that a page resumes correctly after its last item is cancelled.
+        """
+        page = self.hotel.query_reservations('Test Hotel', limit=3)
+        self.hotel.cancel_reservation_by_id('Test Hotel',
+                                            page['next_cursor'])
+        page = self.hotel.query_reservations('Test Hotel', limit=3,
+                                             cursor=page['next_cursor'])
+        self.assertEqual([reservation['id']
+                          for reservation in page['reservations']],
+                         [4, 5, 6])
+
+    def test_hotel_not_found(self):
+        """
+        Tests querying a hotel that does not exist.
+        """
+        self.assertEqual(self.hotel.query_reservations('Grand Hotel'),
+                         'Hotel not found')
+        self.assertEqual(self.customer.query_customers('Grand Hotel'),
+                         'Hotel Grand Hotel not found')
+
+    def test_invalid_limit(self):
+        """
+        Tests that a page must hold at least one item.
+        """
+        for limit in (0, -1):
+            self.assertEqual(self.hotel.query_reservations('Test Hotel',
+                                                           limit=limit),
+                             'Limit must be at least 1')
+            self.assertEqual(self.customer.query_customers('Test Hotel',
+                                                           limit=limit),
+                             'Limit must be at least 1')
+
+    def test_customers_by_prefix(self):
+        """
+        Tests paging through customers filtered by name prefix.
+        """
+        for name in ('Jack Brown', 'Emma Davis', 'Jane Adams'):
+            self.customer.create_customer('Test Hotel', name)
+        page = self.customer.query_customers('Test Hotel', 'Ja', limit=2)
+        self.assertEqual([customer['customer_name']
+                          for customer in page['customers']],
+                         ['Jack Brown', 'Jane Adams'])
+        page = self.customer.query_customers('Test Hotel', 'Ja', limit=2,
+                                             cursor=page['next_cursor'])
+        self.assertEqual([customer['customer_name']
+                          for customer in page['customers']],
+                         ['Jane Smith'])
+        self.assertEqual(page['next_cursor'], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
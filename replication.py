@@ -0,0 +1,162 @@
+"""
+Module for serving hotel reads from replicas of the primary's data.
+
+The primary is any set of Hotel, Customer and Reservation objects sharing a
+ChangeFeed whose log lives in a directory the replicas can read. Each
+replica tails that log from its own byte position and applies the events to
+an in-memory copy of the hotel data, so reads never parse the data file.
+Reads are served once the replica has synced within its staleness bound.
+
+Libraries:
+- copy: Provides deep copies of the base data and of the data served.
+- json: Provides functions for reading and writing checkpoints.
+- time: Provides the clock used to bound staleness and measure lag.
+- change_feed: Provides the ChangeFeed class and the apply_change function.
+- reservation_index: Provides the public view of the hotel entries.
+
+Classes:
+- Replica: An in-memory copy of the hotel data following a change feed log.
+"""
+import copy
+import json
+import time
+from typing import Optional
+
+from change_feed import ChangeFeed, apply_change
+from reservation_index import public_view
+
+
+class Replica:
+    """
+    A class to keep an in-memory copy of the hotel data up to date from the
+    primary's change feed log and serve read-only queries from it.
+
+    Attributes:
+    - feed (ChangeFeed): The feed whose log is followed. Creating it only
+    reads the last event of the log, which is then read from the replica's
+    position on sync.
+    - hotels_data (list): The replicated hotel entries.
+    - sequence (int): The sequence number of the last applied event.
+    - max_staleness (float): The maximum number of seconds a read may be
+    served without syncing first.
+
+    Methods:
+    - from_checkpoint: Creates a replica from a checkpoint file.
+    - checkpoint: Writes the replicated data to a checkpoint file.
+    - sync: Applies every complete event logged since the last sync.
+    - lag: Reports how far the replica is behind the primary.
+    - display_hotel_info: Displays information about a specific hotel.
+    - display_customer_info: Displays information about a customer.
+    """
+    def __init__(self, journal_filename: str = 'changes.jsonl',
+                 base_data: Optional[list] = None,
+                 base_sequence: int = 0,
+                 max_staleness: float = 1.0):
+        """
+        Initializes a Replica object following the given change feed log.
+
+        Parameters:
+        - journal_filename (str, optional): The filename of the primary's
+        change feed log. Defaults to 'changes.jsonl'.
+        - base_data (list, optional): The hotel data the replica starts
+        from. Defaults to an empty list, which replays the whole log.
+        - base_sequence (int, optional): The sequence number of the last
+        event already contained in base_data. Defaults to 0.
+        - max_staleness (float, optional): The maximum number of seconds a
+        read may be served without syncing first. Defaults to 1.0.
+        """
+        self.feed = ChangeFeed(journal_filename)
+        self.hotels_data = copy.deepcopy(base_data) if base_data else []
+        self.sequence = base_sequence
+        self.max_staleness = max_staleness
+        self.synced_at = 0.0
+        self._position = 0
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_filename: str,
+                        journal_filename: str = 'changes.jsonl',
+                        max_staleness: float = 1.0) -> 'Replica':
+        """
+        Creates a replica from a checkpoint written by another replica.
+        """
+        with open(checkpoint_filename, 'r', encoding='UTF-8') as file:
+            checkpoint = json.load(file)
+        replica = cls(journal_filename, checkpoint['hotels'],
+                      checkpoint['sequence'], max_staleness)
+        replica._position = checkpoint['position']
+        return replica
+
+    def checkpoint(self, checkpoint_filename: str):
+        """
+        Writes the replicated data and its position in the log to a
+        checkpoint file, so new replicas do not have to replay the log.
+        """
+        with open(checkpoint_filename, 'w', encoding='UTF-8') as file:
+            json.dump({'sequence': self.sequence,
+                       'position': self._position,
+                       'hotels': self.hotels_data}, file, indent=4)
+
+    def sync(self) -> int:
+        """
+        Applies every complete event logged since the last sync.
+
+        Returns:
+        The number of events applied.
+        """
+        events, self._position = self.feed.read_from(self._position)
+        applied = 0
+        for event in events:
+            if event['sequence'] > self.sequence:
+                apply_change(self.hotels_data, event)
+                self.sequence = event['sequence']
+                applied += 1
+        self.synced_at = time.time()
+        return applied
+
+    def lag(self) -> dict:
+        """
+        Reports how far the replica is behind the primary without applying
+        the pending events.
+
+        Returns:
+        A dict with the number of pending events and the age in seconds of
+        the oldest pending event.
+        """
+        events, _ = self.feed.read_from(self._position)
+        pending = [event for event in events
+                   if event['sequence'] > self.sequence]
+        return {
+            'events': len(pending),
+            'seconds': (time.time() - pending[0]['timestamp']
+                        if pending else 0.0)
+        }
+
+    def _sync_if_stale(self):
+        """
+        Syncs the replica if it has not synced within max_staleness.
+        """
+        if time.time() - self.synced_at >= self.max_staleness:
+            self.sync()
+
+    def display_hotel_info(self, hotel_name: str):
+        """
+        Displays a copy of the information about a specific hotel.
+        """
+        self._sync_if_stale()
+        for hotel in self.hotels_data:
+            if hotel['name'] == hotel_name:
+                return copy.deepcopy(public_view(hotel))
+        return 'Hotel not found'
+
+    def display_customer_info(self, hotel_name: str, customer_name: str):
+        """
+        Displays a copy of the information about a customer from the
+        specified hotel.
+        """
+        self._sync_if_stale()
+        for hotel in self.hotels_data:
+            if hotel['name'] == hotel_name:
+                for customer in hotel['customers']:
+                    if customer['customer_name'] == customer_name:
+                        return dict(customer)
+        return f'Customer {customer_name} not found in {hotel_name}'
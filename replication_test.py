@@ -0,0 +1,127 @@
+"""
+This module contains the tests for the Replica class.
+"""
+import multiprocessing
+import unittest
+from unittest import mock
+from change_feed import ChangeFeed
+from customer import Customer
+from hotel import Hotel
+from replication import Replica
+from testing_utils import TemporaryDirectoryTestCase
+
+
+def read_rooms_from_replica(journal_filename):
+    """
+    Returns the single rooms of 'Test Hotel' as seen by a new replica.
+    """
+    replica = Replica(journal_filename, max_staleness=0)
+    return replica.display_hotel_info('Test Hotel')['rooms']['single']
+
+
+class TestReplica(TemporaryDirectoryTestCase):
+    """
+    A class to test following the primary's log from several replicas.
+    """
+
+    def setUp(self):
+        """
+        Sets up a primary writing its changes to a shared directory.
+        """
+        super().setUp()
+        hotel_filename = self.path('hotels.json')
+        self.journal_filename = self.path('changes.jsonl')
+        feed = ChangeFeed(self.journal_filename)
+        self.hotel = Hotel(hotel_filename, feed)
+        self.customer = Customer(hotel_filename, feed)
+        self.hotel.create_hotel('Test Hotel', 'City Center', {'single': 5})
+
+    def test_replicas_serve_primary_data(self):
+        """
+        Tests that every replica converges to the primary's data.
+        """
+        replicas = [Replica(self.journal_filename, max_staleness=0)
+                    for _ in range(3)]
+        self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        self.customer.create_customer('Test Hotel', 'John Doe')
+        for replica in replicas:
+            self.assertEqual(replica.display_hotel_info('Test Hotel'),
+                             self.hotel.display_hotel_info('Test Hotel'))
+            self.assertEqual(
+                replica.display_customer_info('Test Hotel', 'John Doe'),
+                self.customer.display_customer_info('Test Hotel',
+                                                    'John Doe'))
+
+    def test_creating_a_replica_does_not_read_the_log(self):
+        """
+        Tests that a replica only reads the log when it syncs.
+        """
+        with mock.patch.object(ChangeFeed, 'read',
+                               side_effect=AssertionError), \
+                mock.patch.object(ChangeFeed, 'read_from',
+                                  side_effect=AssertionError):
+            replica = Replica(self.journal_filename)
+        self.assertEqual(replica.feed.sequence, 1)
+
+    def test_reads_return_copies(self):
+        """
+        Tests that changing the data a replica served does not change the
+        replica.
+        """
+        replica = Replica(self.journal_filename, max_staleness=3600)
+        self.customer.create_customer('Test Hotel', 'John Doe')
+        replica.sync()
+        replica.display_hotel_info('Test Hotel')['rooms']['single'] = 0
+        replica.display_customer_info('Test Hotel',
+                                      'John Doe')['customer_name'] = 'Jo'
+        hotel = replica.display_hotel_info('Test Hotel')
+        self.assertEqual(hotel['rooms']['single'], 5)
+        self.assertEqual(hotel['customers'][0]['customer_name'], 'John Doe')
+
+    def test_replicas_in_separate_processes(self):
+        """
+        Tests that replicas running in other processes see the same data.
+        """
+        self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        with multiprocessing.Pool(3) as pool:
+            results = pool.map(read_rooms_from_replica,
+                               [self.journal_filename] * 3)
+        self.assertEqual(results, [4, 4, 4])
+
+    def test_reads_are_bounded_by_staleness(self):
+        """
+        Tests that a replica within its staleness bound serves its copy and
+        reports the pending events as lag.
+        """
+        replica = Replica(self.journal_filename, max_staleness=3600)
+        replica.sync()
+        self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        self.assertEqual(
+            replica.display_hotel_info('Test Hotel')['rooms']['single'], 5)
+        lag = replica.lag()
+        self.assertEqual(lag['events'], 2)
+        self.assertGreaterEqual(lag['seconds'], 0)
+        replica.sync()
+        self.assertEqual(replica.lag(), {'events': 0, 'seconds': 0.0})
+        self.assertEqual(
+            replica.display_hotel_info('Test Hotel')['rooms']['single'], 4)
+
+    def test_replica_from_checkpoint(self):
+        """
+        Tests that a replica started from a checkpoint only applies the
+        events logged after it.
+        """
+        replica = Replica(self.journal_filename)
+        replica.sync()
+        checkpoint_filename = self.path('checkpoint.json')
+        replica.checkpoint(checkpoint_filename)
+        self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        replica = Replica.from_checkpoint(checkpoint_filename,
+                                          self.journal_filename)
+        self.assertEqual(replica.sync(), 2)
+        self.assertEqual(replica.display_hotel_info('Test Hotel'),
+                         self.hotel.display_hotel_info('Test Hotel'))
+
+
+if __name__ == '__main__':
+    unittest.main()
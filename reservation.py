@@ -8,16 +8,29 @@ Libraries:
 information.
 - utilities.json_data_handler: Provides the JSONDataHandler class for handling
 JSON data.
+- reservation_index: Provides the ReservationIndex class for looking up
+reservations by ID.
+- change_feed: Provides the ChangeFeed class for publishing changes.
+- inventory: Provides the SharedInventory class and InventoryMixin for
+claiming rooms.
+- paged_store: Provides the PagedStore class for paging hotels in on demand.
 
 Classes:
 - Reservation: A class to represent hotel reservations and manage
 reservation-related operations.
 """
+from typing import Optional
+
+import change_feed
+from change_feed import ChangeFeed
 from customer import Customer
-from json_handler import JSONDataHandler
+from inventory import InventoryMixin, SharedInventory
+from json_handler import JSONDataHandler, exclusive
+from paged_store import PagedStore
+from reservation_index import ReservationIndex
 
 
-class Reservation(JSONDataHandler):
+class Reservation(JSONDataHandler, InventoryMixin):
     """
     A class to represent hotel reservations and manage reservation-related
     operations.
@@ -26,14 +39,26 @@ class Reservation(JSONDataHandler):
     - hotel_filename (str): The filename for storing hotel data in JSON format.
     - customer (Customer): An instance of the Customer class for managing
     customer information.
+    - feed (ChangeFeed): The feed changes are published to, if any.
+    - inventory (SharedInventory): The shared inventory rooms are claimed
+    from, if any.
+    - store (PagedStore): The paged store used instead of the JSON file, if
+    any.
 
     Methods:
     - create_reservation: Creates a new reservation for a customer in a
     specified hotel.
     - cancel_reservation: Cancels a reservation for a customer in a specified
     hotel.
+    - cancel_reservation_by_id: Cancels a reservation by its ID in a specified
+    hotel.
+    - find_reservation: Retrieves a reservation by its ID in a specified
+    hotel.
     """
-    def __init__(self, hotel_filename='hotels.json'):
+    def __init__(self, hotel_filename='hotels.json',
+                 feed: Optional[ChangeFeed] = None,
+                 inventory: Optional[SharedInventory] = None,
+                 store: Optional[PagedStore] = None):
         """
         Initializes a Reservation object with the specified hotel data
         filename.
@@ -41,9 +66,16 @@ class Reservation(JSONDataHandler):
         Parameters:
         - hotel_filename (str): The filename for storing hotel data in JSON
         format. Defaults to 'hotels.json'.
+        - feed (ChangeFeed, optional): The feed changes are published to.
+        Defaults to None.
+        - inventory (SharedInventory, optional): The shared inventory rooms
+        are claimed from. Defaults to None.
+        - store (PagedStore, optional): The paged store used instead of the
+        JSON file. Defaults to None.
         """
-        super().__init__(hotel_filename)
-        self.customer = Customer(hotel_filename)
+        super().__init__(hotel_filename, store, feed)
+        self.inventory = inventory
+        self.customer = Customer(hotel_filename, feed, store)
 
     def create_reservation(self, hotel_name: str, customer_name: str,
                            reservation_date: str, room_type: str = 'single'):
@@ -62,6 +94,28 @@ class Reservation(JSONDataHandler):
         room type, hotel, or customer was not found or the reservation could
         not be created.
         """
+        # Claim the room from the shared inventory, if it tracks the room
+        # type, rejecting the reservation without file I/O or locking if
+        # there are no rooms left
+        remaining = self._claim_room(hotel_name, room_type)
+        if remaining is not None and remaining < 0:
+            return f'No {room_type} rooms available'
+        return self._create_claimed_reservation(hotel_name, customer_name,
+                                                reservation_date, room_type,
+                                                remaining)
+
+    @exclusive
+    def _create_claimed_reservation(self, hotel_name: str,
+                                    customer_name: str,
+                                    reservation_date: str, room_type: str,
+                                    remaining: Optional[int]):
+        """
+        Saves a reservation for a room claimed from the shared inventory,
+        or counted in the data file if remaining is None, giving the claim
+        back if the reservation is not created.
+        """
+        # Drop the claim if the hotel's counters were invalidated meanwhile
+        remaining = self._confirm_claim(hotel_name, room_type, remaining)
         # Get customer information
         customer_info = self.customer.display_customer_info(hotel_name,
                                                             customer_name)
@@ -71,57 +125,63 @@ class Reservation(JSONDataHandler):
             customer_id = customer_info.get('customer_id')
             # Check if the customer ID is None
             if customer_id is None:
-                # Create the customer
+                self._give_back_claim(hotel_name, room_type, remaining)
                 return (
                     f'Customer {customer_name} not found or could not be '
                     f'created'
                     )
         # If customer information was not found, return the customer info
         else:
-            # Return the customer info
+            # Give the claimed room back and return the customer info
+            self._give_back_claim(hotel_name, room_type, remaining)
             return customer_info
 
-        # Load hotel data
-        hotels_data = self.load_data()
-        # Iterate through each hotel in the data
-        for hotel_data in hotels_data:
-            # Check if the hotel name matches the specified hotel
-            if hotel_data['name'] == hotel_name:
-                # Check if the room type is available
-                if room_type in hotel_data['rooms']:
-                    # Check if there are available rooms
-                    if hotel_data['rooms'][room_type] > 0:
-                        # Create the reservation
-                        reservation_id = hotel_data.get('reservation_counter',
-                                                        0) + 1
-                        # Update the reservation counter
-                        hotel_data['reservation_counter'] = reservation_id
-                        # Decrement the number of available rooms
-                        hotel_data['rooms'][room_type] -= 1
-                        # Create the reservation
-                        reservation = {
-                            'id': reservation_id,
-                            'customer_id': customer_id,
-                            'customer_name': customer_name,
-                            'room_type': room_type,
-                            'date': reservation_date
-                        }
-                        # Add the reservation to the list of reservations
-                        hotel_data['reservations'].append(reservation)
-                        # Save the updated hotel data
-                        self.save_data(hotels_data)
-                        # Return a success message
-                        return (
-                            f'Reservation for {customer_name} created at '
-                            f'{hotel_name}'
-                        )
-                    # If no rooms are available, return an error message
-                    return f'No {room_type} rooms available'
-                # If the room type is not found, return an error message
-                return f'{room_type} room type not found in {hotel_name}'
+        # Load the hotel data
+        hotels_data, hotel_data = self.load_hotel(hotel_name)
+        # Check if the hotel was found
+        if hotel_data:
+            # Check if the room type is available
+            if room_type in hotel_data['rooms']:
+                # The shared inventory is authoritative for the room count
+                if remaining is not None:
+                    hotel_data['rooms'][room_type] = remaining + 1
+                # Check if there are available rooms
+                if hotel_data['rooms'][room_type] > 0:
+                    # Take the next reservation ID from the index
+                    index = ReservationIndex(hotel_data)
+                    reservation_id = index.next_id()
+                    # Decrement the number of available rooms
+                    hotel_data['rooms'][room_type] -= 1
+                    # Create the reservation
+                    reservation = {
+                        'id': reservation_id,
+                        'customer_id': customer_id,
+                        'customer_name': customer_name,
+                        'room_type': room_type,
+                        'date': reservation_date
+                    }
+                    # Add the reservation to the list of reservations
+                    index.add(reservation)
+                    # Save the updated hotel data
+                    self.save_hotel(hotels_data, hotel_data)
+                    # Publish the change
+                    self._publish(change_feed.RESERVATION_CREATED,
+                                  hotel_name, reservation=reservation)
+                    # Return a success message
+                    return (
+                        f'Reservation for {customer_name} created at '
+                        f'{hotel_name}'
+                    )
+                # If no rooms are available, return an error message
+                return f'No {room_type} rooms available'
+            # If the room type is not found, return an error message
+            self._give_back_claim(hotel_name, room_type, remaining)
+            return f'{room_type} room type not found in {hotel_name}'
         # If the hotel is not found, return an error message
+        self._give_back_claim(hotel_name, room_type, remaining)
         return f'Hotel {hotel_name} not found'
 
+    @exclusive
     def cancel_reservation(self, hotel_name: str, customer_name: str):
         """
         Cancels a reservation for a customer in a specified hotel.
@@ -135,33 +195,106 @@ class Reservation(JSONDataHandler):
         A string indicating the success of the cancellation or a message if
         the reservation, hotel, or customer was not found.
         """
-        # Load hotel data
-        hotels_data = self.load_data()
-
-        # Iterate through each hotel in the data
-        for hotel_data in hotels_data:
-            if hotel_data['name'] == hotel_name:
-                # Check if the hotel is found, retrieve the list of customers
-                for reservation in hotel_data['reservations']:
-                    # Check if the customer name matches the specified customer
-                    if reservation['customer_name'] == customer_name:
-                        # If the customer is found, increment the number of
-                        # available rooms and remove the reservation
-                        room_type = reservation['room_type']
-                        # Increment the number of available rooms
-                        hotel_data['rooms'][room_type] += 1
-                        # Remove the reservation from the list of reservations
-                        hotel_data['reservations'].remove(reservation)
-                        # Save the updated hotel data
-                        self.save_data(hotels_data)
-                        # Return a success message
-                        return (
-                            f'Reservation for {customer_name} cancelled at '
-                            f'{hotel_name}'
-                            )
-                # If the reservation is not found, return an error message
+        # Load the hotel data
+        hotels_data, hotel_data = self.load_hotel(hotel_name)
+        # Check if the hotel was found
+        if hotel_data:
+            index = ReservationIndex(hotel_data)
+            # Find the first live reservation made by the customer
+            reservation = index.find_by_customer(customer_name)
+            if reservation:
+                # Tombstone the reservation and give the room back
+                index.remove(reservation['id'])
+                self._return_room(hotel_name, hotel_data,
+                                  reservation['room_type'])
+                # Save the updated hotel data and publish the change
+                self.save_hotel(hotels_data, hotel_data)
+                self._publish(change_feed.RESERVATION_CANCELLED,
+                              hotel_name,
+                              reservation_id=reservation['id'],
+                              room_type=reservation['room_type'])
+                # Return a success message
                 return (
-                    f'No reservation found for {customer_name} in {hotel_name}'
+                    f'Reservation for {customer_name} cancelled at '
+                    f'{hotel_name}'
                     )
+            # If the reservation is not found, return an error message
+            return (
+                f'No reservation found for {customer_name} in {hotel_name}'
+                )
+        # If the hotel is not found, return an error message
+        return f'Hotel {hotel_name} not found'
+
+    @exclusive
+    def cancel_reservation_by_id(self, hotel_name: str, reservation_id: int):
+        """
+        Cancels a reservation by its ID in a specified hotel.
+
+        The latency still grows with the number of reservations: the JSON
+        file is parsed and rewritten whole, and a paged store copies the
+        hotel's reservation list and index, which is cheaper but not
+        constant.
+
+        Parameters:
+        - hotel_name (str): The name of the hotel.
+        - reservation_id (int): The ID of the reservation to be canceled.
+
+        Returns:
+        A string indicating the success of the cancellation or a message if
+        the reservation or hotel was not found.
+        """
+        # Load the hotel data
+        hotels_data, hotel_data = self.load_hotel(hotel_name)
+        # Check if the hotel was found
+        if hotel_data:
+            # Tombstone the reservation through the ID index
+            reservation = ReservationIndex(hotel_data).remove(
+                reservation_id)
+            if reservation:
+                # Give the room back and save the updated hotel data
+                self._return_room(hotel_name, hotel_data,
+                                  reservation['room_type'])
+                self.save_hotel(hotels_data, hotel_data)
+                # Publish the change
+                self._publish(change_feed.RESERVATION_CANCELLED,
+                              hotel_name,
+                              reservation_id=reservation_id,
+                              room_type=reservation['room_type'])
+                # Return a success message
+                return (
+                    f'Reservation {reservation_id} cancelled at '
+                    f'{hotel_name}'
+                    )
+            # If the reservation is not found, return an error message
+            return (
+                f'No reservation {reservation_id} found in {hotel_name}'
+                )
+        # If the hotel is not found, return an error message
+        return f'Hotel {hotel_name} not found'
+
+    def find_reservation(self, hotel_name: str, reservation_id: int):
+        """
+        Retrieves a reservation by its ID in a specified hotel.
+
+        Parameters:
+        - hotel_name (str): The name of the hotel.
+        - reservation_id (int): The ID of the reservation.
+
+        Returns:
+        The reservation if found, otherwise a message indicating the
+        reservation or hotel was not found.
+        """
+        # Load the hotel data
+        _, hotel_data = self.load_hotel(hotel_name)
+        # Check if the hotel was found
+        if hotel_data:
+            # Look the reservation up through the ID index
+            reservation = ReservationIndex(hotel_data).get(reservation_id)
+            if reservation:
+                return reservation
+            # If the reservation is not found, return an error message
+            return (
+                f'No reservation {reservation_id} found in {hotel_name}'
+                )
         # If the hotel is not found, return an error message
         return f'Hotel {hotel_name} not found'
@@ -0,0 +1,211 @@
+"""
+Module for indexing the reservations of a hotel by reservation ID.
+
+The index is kept next to the reservations inside the hotel entry.
+Cancelled reservations are left in place as tombstones (``None``) to keep
+every indexed position valid, and the list is compacted once enough
+tombstones have accumulated. The paged store persists the index and the
+tombstones; the JSON file only ever holds the public view of each hotel,
+so its format is unchanged and the index is rebuilt when it is loaded. IDs are
+handed out from a counter kept in the entry. When the index is built from a
+list whose IDs repeat or do not increase, as written before the counter
+existed, the offending reservations get new IDs, so every ID is unique and
+IDs increase with the position in the list.
+
+The index only removes the scan and the list shift from a cancellation; it
+does not make cancellations take constant time. With the JSON file every
+change still parses and rewrites the whole file and rebuilds the index, and
+with the paged store every change copies the hotel's reservation list and
+index, so the latency still grows with the number of reservations.
+
+Classes:
+- ReservationIndex: Maps reservation IDs to their position in a hotel's
+reservation list.
+
+Functions:
+- public_view: Returns a hotel entry without the index bookkeeping.
+"""
+from typing import Iterator
+
+COMPACTION_THRESHOLD = 1000
+
+BOOKKEEPING_KEYS = ('reservation_index', 'tombstones')
+
+
+def public_view(hotel_data: dict) -> dict:
+    """
+    Returns a shallow copy of a hotel entry without the index and tombstone
+    count, and with the cancelled reservations left out.
+    """
+    hotel = {key: value for key, value in hotel_data.items()
+             if key not in BOOKKEEPING_KEYS}
+    hotel['reservations'] = [reservation
+                             for reservation in hotel_data['reservations']
+                             if reservation is not None]
+    return hotel
+
+
+class ReservationIndex:
+    """
+    A class to look up, add and cancel reservations of a single hotel entry
+    by reservation ID.
+
+    Attributes:
+    - hotel_data (dict): The hotel entry whose reservations are indexed.
+    - compaction_threshold (int): The minimum number of tombstones before the
+    reservation list is compacted.
+
+    Methods:
+    - next_id: Takes the next unused reservation ID.
+    - get: Returns the reservation with the given ID.
+    - add: Appends a reservation and indexes it.
+    - remove: Replaces a reservation with a tombstone.
+    - find_by_customer: Returns the first live reservation of a customer.
+    - live: Iterates over the live reservations.
+    - live_after: Iterates over the live reservations after a given ID.
+    - compact: Drops tombstones and rebuilds the index.
+    - rebuild: Rebuilds the index from the reservation list.
+    """
+    def __init__(self, hotel_data: dict,
+                 compaction_threshold: int = COMPACTION_THRESHOLD):
+        """
+        Initializes the index for the given hotel entry, building it if the
+        entry was stored without one.
+
+        Parameters:
+        - hotel_data (dict): The hotel entry whose reservations are indexed.
+        - compaction_threshold (int, optional): The minimum number of
+        tombstones before the reservation list is compacted. Defaults to
+        COMPACTION_THRESHOLD.
+        """
+        self.hotel_data = hotel_data
+        self.compaction_threshold = compaction_threshold
+        if 'reservation_index' not in hotel_data:
+            self.rebuild()
+
+    @property
+    def _index(self) -> dict:
+        return self.hotel_data['reservation_index']
+
+    def rebuild(self):
+        """
+        Rebuilds the index and the tombstone count from the reservation list,
+        raising the reservation counter to the highest ID in the list. A
+        reservation whose ID is not greater than the one before it is given
+        the next unused ID.
+        """
+        reservations = self.hotel_data['reservations']
+        live = [reservation['id'] for reservation in reservations
+                if reservation is not None]
+        counter = max([self.hotel_data.get('reservation_counter', 0)]
+                      + live)
+        index = {}
+        previous_id = 0
+        for position, reservation in enumerate(reservations):
+            if reservation is None:
+                continue
+            if reservation['id'] <= previous_id:
+                counter += 1
+                # Replace the entry, since entries may be shared
+                reservation = dict(reservation, id=counter)
+                reservations[position] = reservation
+            previous_id = reservation['id']
+            index[str(reservation['id'])] = position
+        self.hotel_data['reservation_counter'] = counter
+        self.hotel_data['reservation_index'] = index
+        self.hotel_data['tombstones'] = len(reservations) - len(live)
+
+    def next_id(self) -> int:
+        """
+        Takes the next unused reservation ID from the counter.
+        """
+        reservation_id = self.hotel_data.get('reservation_counter', 0) + 1
+        self.hotel_data['reservation_counter'] = reservation_id
+        return reservation_id
+
+    def get(self, reservation_id: int) -> dict:
+        """
+        Returns the reservation with the given ID, or an empty dict if there
+        is no live reservation with that ID.
+        """
+        position = self._index.get(str(reservation_id))
+        if position is None:
+            return {}
+        return self.hotel_data['reservations'][position]
+
+    def add(self, reservation: dict):
+        """
+        Appends a reservation to the hotel entry and indexes it by its ID.
+        """
+        reservations = self.hotel_data['reservations']
+        self._index[str(reservation['id'])] = len(reservations)
+        reservations.append(reservation)
+
+    def remove(self, reservation_id: int) -> dict:
+        """
+        Replaces the reservation with the given ID by a tombstone, compacting
+        the list if the threshold has been reached.
+
+        Returns:
+        The removed reservation, or an empty dict if it was not found.
+        """
+        position = self._index.pop(str(reservation_id), None)
+        if position is None:
+            return {}
+        reservations = self.hotel_data['reservations']
+        reservation = reservations[position]
+        reservations[position] = None
+        self.hotel_data['tombstones'] = (
+            self.hotel_data.get('tombstones', 0) + 1)
+        if self._should_compact():
+            self.compact()
+        return reservation
+
+    def find_by_customer(self, customer_name: str) -> dict:
+        """
+        Returns the first live reservation made by the given customer, or an
+        empty dict if there is none.
+        """
+        for reservation in self.live():
+            if reservation['customer_name'] == customer_name:
+                return reservation
+        return {}
+
+    def live(self) -> Iterator[dict]:
+        """
+        Iterates over the reservations that have not been cancelled.
+        """
+        return (reservation
+                for reservation in self.hotel_data['reservations']
+                if reservation is not None)
+
+    def live_after(self, reservation_id: int) -> Iterator[dict]:
+        """
+        Iterates over the live reservations whose ID is greater than the
+        given one, in ID order. Reservations are appended with increasing
+        IDs, so iteration starts right after the given reservation when it
+        is still live.
+        """
+        reservations = self.hotel_data['reservations']
+        start = self._index.get(str(reservation_id), -1) + 1
+        return (reservations[position]
+                for position in range(start, len(reservations))
+                if reservations[position] is not None
+                and reservations[position]['id'] > reservation_id)
+
+    def compact(self):
+        """
+        Drops every tombstone from the reservation list and rebuilds the
+        index.
+        """
+        self.hotel_data['reservations'] = list(self.live())
+        self.rebuild()
+
+    def _should_compact(self) -> bool:
+        """
+        Compacts only once tombstones make up half of the list, so the cost
+        of rewriting the list is amortized over the cancellations.
+        """
+        tombstones = self.hotel_data['tombstones']
+        return (tombstones >= self.compaction_threshold
+                and 2 * tombstones >= len(self.hotel_data['reservations']))
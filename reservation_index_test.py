@@ -0,0 +1,121 @@
+"""
+This module contains the tests for the ReservationIndex class.
+"""
+import unittest
+from reservation_index import ReservationIndex, public_view
+
+
+def make_reservation(reservation_id, customer_name='Jane Smith'):
+    """
+    Builds a reservation entry with the given ID.
+    """
+    return {
+        'id': reservation_id,
+        'customer_id': 1,
+        'customer_name': customer_name,
+        'room_type': 'single',
+        'date': '2024-02-20'
+    }
+
+
+class TestReservationIndex(unittest.TestCase):
+    """
+    A class to test reservation lookups, tombstones and compaction.
+    """
+
+    def setUp(self):
+        """
+        Sets up a hotel entry stored without an index.
+        """
+        self.hotel_data = {
+            'name': 'Luxury Suites',
+            'rooms': {'single': 3},
+            'reservations': [make_reservation(1), make_reservation(2)],
+            'customers': []
+        }
+
+    def test_builds_index_for_legacy_entry(self):
+        """
+        Tests that an entry without an index gets one on first use.
+        """
+        index = ReservationIndex(self.hotel_data)
+        self.assertEqual(index.get(2)['id'], 2)
+        self.assertEqual(self.hotel_data['reservation_index'],
+                         {'1': 0, '2': 1})
+
+    def test_legacy_entry_continues_ids(self):
+        """
+        Tests that an entry without a counter continues after its highest
+        reservation ID.
+        """
+        self.assertEqual(ReservationIndex(self.hotel_data).next_id(), 3)
+
+    def test_duplicate_ids_are_renumbered(self):
+        """
+        Tests that repeated IDs are replaced by new ones, so each ID finds
+        its own reservation.
+        """
+        self.hotel_data['reservations'].append(make_reservation(1, 'Bob'))
+        index = ReservationIndex(self.hotel_data)
+        self.assertEqual(index.get(1)['customer_name'], 'Jane Smith')
+        self.assertEqual(index.get(3)['customer_name'], 'Bob')
+        self.assertEqual(index.next_id(), 4)
+        self.assertEqual([reservation['id'] for reservation
+                          in index.live_after(1)], [2, 3])
+
+    def test_remove_leaves_tombstone(self):
+        """
+        Tests that removing a reservation keeps the other positions valid.
+        """
+        index = ReservationIndex(self.hotel_data)
+        self.assertEqual(index.remove(1)['id'], 1)
+        self.assertEqual(self.hotel_data['reservations'][0], None)
+        self.assertEqual(self.hotel_data['tombstones'], 1)
+        self.assertEqual(index.get(1), {})
+        self.assertEqual(index.get(2)['id'], 2)
+
+    def test_remove_missing_reservation(self):
+        """
+        Tests removing a reservation that does not exist.
+        """
+        index = ReservationIndex(self.hotel_data)
+        self.assertEqual(index.remove(99), {})
+        self.assertEqual(self.hotel_data['tombstones'], 0)
+
+    def test_find_by_customer_skips_tombstones(self):
+        """
+        Tests that a customer's second reservation is found after the first
+        one is cancelled.
+        """
+        index = ReservationIndex(self.hotel_data)
+        index.remove(1)
+        self.assertEqual(index.find_by_customer('Jane Smith')['id'], 2)
+
+    def test_compacts_once_threshold_reached(self):
+        """
+        Tests that tombstones are dropped once the threshold is reached.
+        """
+        index = ReservationIndex(self.hotel_data, compaction_threshold=2)
+        index.add(make_reservation(3))
+        index.remove(1)
+        self.assertEqual(len(self.hotel_data['reservations']), 3)
+        index.remove(3)
+        self.assertEqual(self.hotel_data['reservations'],
+                         [make_reservation(2)])
+        self.assertEqual(self.hotel_data['reservation_index'], {'2': 0})
+        self.assertEqual(self.hotel_data['tombstones'], 0)
+
+    def test_public_view_hides_bookkeeping(self):
+        """
+        Tests that the public view leaves out tombstones and the index.
+        """
+        ReservationIndex(self.hotel_data).remove(1)
+        hotel = public_view(self.hotel_data)
+        self.assertEqual(hotel['reservations'], [make_reservation(2)])
+        self.assertNotIn('reservation_index', hotel)
+        self.assertNotIn('tombstones', hotel)
+        self.assertEqual(self.hotel_data['reservations'][0], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -104,3 +104,30 @@ class TestReservation(unittest.TestCase):
         self.assertEqual(self.reservation.cancel_reservation(
             'Grand Hotel', 'Jane Smith'),
             'Hotel Grand Hotel not found')
+
+    def test_cancel_reservation_by_id(self):
+        """
+        Tests canceling the second reservation of a customer by its ID.
+        """
+        self.reservation.create_reservation('Luxury Suites', 'Emma Davis',
+                                            '2024-02-23', 'suite')
+        self.reservation.create_reservation('Luxury Suites', 'Emma Davis',
+                                            '2024-02-24', 'suite')
+        reservation_id = self.reservation.load_data()[0][
+            'reservation_counter']
+        self.assertEqual(self.reservation.cancel_reservation_by_id(
+            'Luxury Suites', reservation_id),
+            f'Reservation {reservation_id} cancelled at Luxury Suites')
+        self.assertEqual(self.reservation.find_reservation(
+            'Luxury Suites', reservation_id),
+            f'No reservation {reservation_id} found in Luxury Suites')
+        self.assertEqual(self.reservation.find_reservation(
+            'Luxury Suites', reservation_id - 1)['date'], '2024-02-23')
+
+    def test_cancel_reservation_by_id_not_found(self):
+        """
+        Tests canceling a reservation ID that does not exist.
+        """
+        self.assertEqual(self.reservation.cancel_reservation_by_id(
+            'Luxury Suites', 999),
+            'No reservation 999 found in Luxury Suites')
@@ -0,0 +1,234 @@
+"""
+Module for reading hotel data from consistent snapshots.
+
+A VersionStore keeps the hotel data as a sequence of immutable versions.
+Each change event produces a new version that copies only the hotel it
+touches and shares every other hotel with the previous version, so readers
+can iterate a pinned version without locks while writers keep committing.
+Versions are reclaimed once no reader has them pinned. Versions hold the
+public view of each hotel, with only its live reservations and without the
+reservation index.
+
+A store attached to a change feed tails the feed's log file, so it sees the
+changes of every writer appending to that log, in this process or another.
+Changes published through the attached ChangeFeed object are applied as
+they are published; changes from other writers are applied when the next
+version is pinned or sync is called.
+
+Libraries:
+- copy: Provides deep copies of the hotels and events being applied.
+- os: Provides the size of the log file a store starts tailing at.
+- threading: Provides the locks guarding the version bookkeeping.
+- change_feed: Provides the ChangeFeed class and the apply_change function.
+- json_handler: Provides the JSONDataHandler class for loading the data.
+- reservation_index: Provides the public view of the hotel entries.
+
+Classes:
+- VersionStore: Holds the versions of the hotel data.
+- ReadView: A pinned version of the hotel data.
+"""
+import copy
+import os
+import threading
+from typing import Iterator, Optional
+
+from change_feed import ChangeFeed, apply_change
+from json_handler import JSONDataHandler
+from reservation_index import public_view
+
+
+class ReadView:
+    """
+    A class to represent a pinned, read-only version of the hotel data.
+
+    The hotel entries are public views, holding only the live reservations
+    and no index bookkeeping. They are shared with the store and must not
+    be modified.
+
+    Attributes:
+    - version (int): The version number of the snapshot.
+    - hotels (tuple): The hotel entries of the snapshot.
+
+    Methods:
+    - find_hotel: Finds a hotel of the snapshot by its name.
+    - release: Unpins the snapshot so it can be reclaimed.
+    """
+    def __init__(self, store: 'VersionStore', version: int, hotels: tuple):
+        self.version = version
+        self.hotels = hotels
+        self._store = store
+        self._released = False
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.hotels)
+
+    def __len__(self) -> int:
+        return len(self.hotels)
+
+    def __enter__(self) -> 'ReadView':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def find_hotel(self, hotel_name: str) -> dict:
+        """
+        Finds a hotel of the snapshot by its name, returning an empty dict
+        if it is not found.
+        """
+        for hotel in self.hotels:
+            if hotel['name'] == hotel_name:
+                return hotel
+        return {}
+
+    def release(self):
+        """
+        Unpins the snapshot. Releasing a view more than once has no effect.
+        """
+        if not self._released:
+            self._released = True
+            self._store.unpin(self.version)
+
+
+class VersionStore:
+    """
+    A class to keep copy-on-write versions of the hotel data.
+
+    Attributes:
+    - version (int): The number of the latest version.
+
+    Methods:
+    - from_file: Creates a store from a hotel data file.
+    - attach: Makes the store follow the log of a change feed.
+    - sync: Applies the events logged since the last sync.
+    - apply: Commits a new version from a change event.
+    - pin: Returns a ReadView of the latest version.
+    - unpin: Releases a pinned version.
+    - retained_versions: Returns the numbers of the versions kept in memory.
+    """
+    def __init__(self, hotels_data: list):
+        """
+        Initializes a VersionStore whose first version holds the given
+        hotel entries.
+
+        Parameters:
+        - hotels_data (list): The hotel entries, as stored in the JSON file.
+        """
+        self.version = 0
+        self._versions = {0: tuple(public_view(hotel) for hotel
+                                   in copy.deepcopy(hotels_data))}
+        self._pins = {}
+        self._lock = threading.Lock()
+        self._feed: Optional[ChangeFeed] = None
+        self._position = 0
+        self._sync_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filename: str = 'hotels.json',
+                  feed: Optional[ChangeFeed] = None) -> 'VersionStore':
+        """
+        Creates a store from a hotel data file, following the log of the
+        given feed so later changes become new versions. The file is loaded
+        and the store attached while holding the data file lock, which file
+        writers hold until they have published, so no change is missed or
+        applied twice. Writers in other processes are seen through the log,
+        when the next version is pinned or sync is called.
+        """
+        handler = JSONDataHandler(filename)
+        with handler.locked():
+            store = cls(handler.load_data())
+            if feed is not None:
+                store.attach(feed)
+        return store
+
+    def attach(self, feed: ChangeFeed):
+        """
+        Makes the store follow the log of a change feed from its current
+        end. Events published through this feed object are applied right
+        away; events other writers append to the log are applied by sync,
+        which pin calls first.
+        """
+        with self._sync_lock:
+            self._feed = feed
+            self._position = (os.path.getsize(feed.filename)
+                              if os.path.exists(feed.filename) else 0)
+        feed.subscribe(self._on_publish)
+
+    def sync(self) -> int:
+        """
+        Applies the events appended to the followed log since the last sync,
+        in log order, and returns how many were applied.
+        """
+        if self._feed is None:
+            return 0
+        with self._sync_lock:
+            events, self._position = self._feed.read_from(self._position)
+            for event in events:
+                self.apply(event)
+        return len(events)
+
+    def _on_publish(self, _event: dict):
+        """
+        Catches up with the log when the followed feed publishes, so events
+        from other writers logged before this one are applied first.
+        """
+        self.sync()
+
+    def apply(self, event: dict):
+        """
+        Commits a new version with the change event applied, copying only
+        the hotel it changes. The event is copied too, since the writer may
+        keep changing the objects it published.
+        """
+        event = copy.deepcopy(event)
+        with self._lock:
+            hotels = list(self._versions[self.version])
+            changed = event['data'].get('hotel')
+            for position, hotel in enumerate(hotels):
+                if hotel['name'] == event['hotel_name']:
+                    hotels[position] = changed = copy.deepcopy(hotel)
+                    break
+            apply_change(hotels, event)
+            # Keep the changed hotel free of tombstones and the index
+            for position, hotel in enumerate(hotels):
+                if hotel is changed:
+                    hotels[position] = public_view(hotel)
+            self.version += 1
+            self._versions[self.version] = tuple(hotels)
+            self._reclaim()
+
+    def pin(self) -> ReadView:
+        """
+        Pins the latest version and returns a view of it, first applying
+        the events logged since the last sync.
+        """
+        self.sync()
+        with self._lock:
+            version = self.version
+            self._pins[version] = self._pins.get(version, 0) + 1
+            return ReadView(self, version, self._versions[version])
+
+    def unpin(self, version: int):
+        """
+        Releases a pinned version, reclaiming it if it is no longer used.
+        """
+        with self._lock:
+            self._pins[version] -= 1
+            if not self._pins[version]:
+                del self._pins[version]
+            self._reclaim()
+
+    def retained_versions(self) -> list:
+        """
+        Returns the numbers of the versions kept in memory.
+        """
+        with self._lock:
+            return sorted(self._versions)
+
+    def _reclaim(self):
+        """
+        Drops every version that is neither the latest nor pinned.
+        """
+        for version in list(self._versions):
+            if version != self.version and version not in self._pins:
+                del self._versions[version]
@@ -0,0 +1,131 @@
+"""
+This module contains the tests for the VersionStore class.
+"""
+import unittest
+from change_feed import ChangeFeed
+from customer import Customer
+from hotel import Hotel
+from paged_store import PagedStore
+from reservation import Reservation
+from snapshot import VersionStore
+from testing_utils import TemporaryDirectoryTestCase
+
+
+class TestVersionStore(TemporaryDirectoryTestCase):
+    """
+    A class to test snapshot isolation and version reclamation.
+    """
+
+    def setUp(self):
+        """
+        Sets up two hotels and a store following their change feed.
+        """
+        super().setUp()
+        self.hotel_filename = self.path('hotels.json')
+        self.feed = ChangeFeed(self.path('changes.jsonl'))
+        self.hotel = Hotel(self.hotel_filename, self.feed)
+        self.hotel.create_hotel('Test Hotel', 'City Center', {'single': 5})
+        self.hotel.create_hotel('Another Hotel', 'Downtown', {'single': 3})
+        self.store = VersionStore.from_file(self.hotel_filename, self.feed)
+        self.reservation = Reservation(self.hotel_filename, self.feed)
+
+    def test_pinned_view_is_not_affected_by_writes(self):
+        """
+        Tests that a view keeps seeing the data it pinned.
+        """
+        with self.store.pin() as view:
+            self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+            self.reservation.cancel_reservation('Test Hotel', 'Jane Smith')
+            self.hotel.reserve_room('Test Hotel', 'John Doe', '2024-02-21')
+            hotel = view.find_hotel('Test Hotel')
+            self.assertEqual(hotel['rooms']['single'], 5)
+            self.assertEqual(hotel['reservations'], [])
+        with self.store.pin() as view:
+            hotel = view.find_hotel('Test Hotel')
+            self.assertEqual(hotel['rooms']['single'], 4)
+            self.assertEqual(hotel['customers'][-1]['customer_name'],
+                             'John Doe')
+
+    def test_unchanged_hotels_are_shared(self):
+        """
+        Tests that a new version only copies the hotel that changed.
+        """
+        with self.store.pin() as before:
+            self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+            with self.store.pin() as after:
+                self.assertIs(before.find_hotel('Another Hotel'),
+                              after.find_hotel('Another Hotel'))
+                self.assertIsNot(before.find_hotel('Test Hotel'),
+                                 after.find_hotel('Test Hotel'))
+
+    def test_pinned_view_is_not_affected_by_paged_writes(self):
+        """
+        Tests that changing objects a writer has published does not change
+        a pinned view.
+        """
+        paged_store = PagedStore.from_json(self.hotel_filename,
+                                           self.path('hotels.jsonl'))
+        customer = Customer(self.hotel_filename, self.feed, paged_store)
+        customer.create_customer('Test Hotel', 'Old')
+        with self.store.pin() as view:
+            customer.modify_customer_info('Test Hotel', 'Old', 'New')
+            hotel = view.find_hotel('Test Hotel')
+            self.assertEqual(hotel['customers'][-1]['customer_name'], 'Old')
+
+    def test_views_hide_cancelled_reservations(self):
+        """
+        Tests that a view holds only live reservations and no index.
+        """
+        self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        self.hotel.reserve_room('Test Hotel', 'John Doe', '2024-02-21')
+        self.hotel.cancel_reservation_by_id('Test Hotel', 1)
+        with self.store.pin() as view:
+            hotel = view.find_hotel('Test Hotel')
+            self.assertEqual([reservation['customer_name']
+                              for reservation in hotel['reservations']],
+                             ['John Doe'])
+            self.assertNotIn('reservation_index', hotel)
+            self.assertNotIn('tombstones', hotel)
+        self.hotel.cancel_reservation_by_id('Test Hotel', 2)
+        with self.store.pin() as view:
+            self.assertEqual(view.find_hotel('Test Hotel')['reservations'],
+                             [])
+
+    def test_store_follows_writers_on_other_feeds(self):
+        """
+        Tests that changes published through another feed on the same log,
+        as another process would, reach the store in log order.
+        """
+        other_feed = ChangeFeed(self.feed.filename)
+        other = Hotel(self.hotel_filename, other_feed)
+        other.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        with self.store.pin() as view:
+            hotel = view.find_hotel('Test Hotel')
+            self.assertEqual(hotel['rooms']['single'], 4)
+        other.reserve_room('Test Hotel', 'John Doe', '2024-02-21')
+        self.hotel.cancel_reservation_by_id('Test Hotel', 2)
+        with self.store.pin() as view:
+            hotel = view.find_hotel('Test Hotel')
+            self.assertEqual([reservation['customer_name']
+                              for reservation in hotel['reservations']],
+                             ['Jane Smith'])
+            self.assertEqual(hotel['rooms']['single'], 4)
+        self.assertEqual(self.store.sync(), 0)
+
+    def test_released_versions_are_reclaimed(self):
+        """
+        Tests that only pinned versions and the latest one are retained.
+        """
+        view = self.store.pin()
+        self.hotel.reserve_room('Test Hotel', 'Jane Smith', '2024-02-20')
+        self.hotel.reserve_room('Test Hotel', 'John Doe', '2024-02-21')
+        self.assertEqual(self.store.retained_versions(),
+                         [view.version, self.store.version])
+        view.release()
+        view.release()
+        self.assertEqual(self.store.retained_versions(),
+                         [self.store.version])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Module with helpers shared by the tests.
+
+Libraries:
+- os: Provides functions for interacting with the operating system.
+- tempfile: Provides the temporary directories the tests write to.
+- unittest: Provides the base test case class.
+
+Classes:
+- TemporaryDirectoryTestCase: A test case working in a temporary directory.
+"""
+import os
+import tempfile
+import unittest
+
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    """
+    A test case that creates a temporary directory before each test and
+    removes it afterwards.
+    """
+
+    def setUp(self):
+        """
+        Creates the temporary directory, removed once the test has run.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, filename: str) -> str:
+        """
+        Returns the path of a file in the temporary directory.
+        """
+        return os.path.join(self.directory.name, filename)
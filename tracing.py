@@ -0,0 +1,312 @@
+"""
+Module for recording the operations made on hotel data and replaying them
+as a load test.
+
+A TraceRecorder wraps Hotel, Customer and Reservation objects and logs every
+public call with its arguments, result and timing to a JSON Lines file.
+Calls that raise are logged with the exception as their result, and a call
+that cannot be logged is counted as dropped, so tracing never changes what
+the caller sees. The
+replay function re-issues a recorded trace against a fresh copy of the hotel
+data, optionally faster and from several threads or processes, and reports
+throughput, latencies and the results that differ from the recorded ones.
+
+Libraries:
+- argparse: Provides the command line interface of the replay tool.
+- json: Provides functions for reading and writing JSON data.
+- os: Provides functions for interacting with the operating system.
+- shutil: Provides the copy of the hotel data replayed against.
+- tempfile: Provides the directory holding the copy of the hotel data.
+- threading: Provides the lock serializing the trace writes.
+- time: Provides the clock used for timing and pacing.
+- concurrent.futures: Provides the thread and process pools.
+
+Classes:
+- TraceRecorder: Records the public calls made on wrapped objects.
+
+Functions:
+- load_trace: Loads the operations of a trace file.
+- replay: Replays a trace and reports its results.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from customer import Customer
+from hotel import Hotel
+from reservation import Reservation
+
+TARGETS = {
+    'Hotel': Hotel,
+    'Customer': Customer,
+    'Reservation': Reservation
+}
+
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+
+class _TracedObject:
+    """
+    A proxy recording the public method calls made on a wrapped object.
+    """
+    def __init__(self, recorder: 'TraceRecorder', target):
+        self._recorder = recorder
+        self._target = target
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._target, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        def traced(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as error:
+                self._recorder.record(type(self._target).__name__, name,
+                                      args, kwargs, f'error: {error!r}',
+                                      started, time.perf_counter() - started)
+                raise
+            self._recorder.record(type(self._target).__name__, name, args,
+                                  kwargs, result, started,
+                                  time.perf_counter() - started)
+            return result
+        return traced
+
+
+class TraceRecorder:
+    """
+    A class to record the public calls made on Hotel, Customer and
+    Reservation objects.
+
+    Attributes:
+    - filename (str): The filename of the JSON Lines trace. Defaults to
+    'trace.jsonl'.
+    - dropped (int): The number of calls that could not be recorded.
+
+    Methods:
+    - wrap: Returns a proxy recording the calls made on an object.
+    - record: Appends a call to the trace.
+    """
+    def __init__(self, filename: str = 'trace.jsonl'):
+        """
+        Initializes a TraceRecorder writing to the specified filename.
+        """
+        self.filename = filename
+        self.dropped = 0
+        # Set by the first recorded call, so idle time before it is not
+        # replayed
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def wrap(self, target):
+        """
+        Returns a proxy that forwards every call to the target and records
+        its public method calls.
+        """
+        return _TracedObject(self, target)
+
+    def record(self, target: str, method: str, args: tuple, kwargs: dict,
+               result, started: float, duration: float):
+        """
+        Appends a call to the trace. Offsets are measured from the start of
+        the first recorded call. Values that are not JSON serializable are
+        recorded as strings, and a call that still cannot be recorded is
+        counted in dropped instead of raising.
+
+        Parameters:
+        - target (str): The class name of the called object.
+        - method (str): The name of the called method.
+        - args (tuple): The positional arguments of the call.
+        - kwargs (dict): The keyword arguments of the call.
+        - result: The value returned by the call.
+        - started (float): The perf_counter value when the call started.
+        - duration (float): The duration of the call in seconds.
+
+        Returns:
+        True if the call was recorded, False if it was dropped.
+        """
+        with self._lock:
+            if self._started is None:
+                self._started = started
+            operation = {
+                # A concurrent call may have started before the first one
+                'offset': max(0.0, started - self._started),
+                'target': target,
+                'method': method,
+                'args': list(args),
+                'kwargs': kwargs,
+                'result': result,
+                'duration': duration
+            }
+            try:
+                line = json.dumps(operation, default=str)
+                with open(self.filename, 'a', encoding='UTF-8') as file:
+                    file.write(line + '\n')
+            except (TypeError, ValueError, OSError):
+                self.dropped += 1
+                return False
+        return True
+
+
+def load_trace(trace_filename: str) -> list:
+    """
+    Loads the operations of a trace file in the order they were recorded.
+    """
+    with open(trace_filename, 'r', encoding='UTF-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def _replay_operations(hotel_filename: str, operations: list,
+                       start: float, speedup: Optional[float]) -> list:
+    """
+    Replays operations in order against the hotel data file, waiting for
+    each operation's scheduled time unless speedup is None.
+
+    Returns:
+    A list of (index, result, latency) tuples.
+    """
+    targets = {name: target(hotel_filename)
+               for name, target in TARGETS.items()}
+    results = []
+    for index, operation in operations:
+        if speedup is not None:
+            delay = start + operation['offset'] / speedup - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        method = getattr(targets[operation['target']], operation['method'])
+        started = time.perf_counter()
+        try:
+            result = method(*operation['args'], **operation['kwargs'])
+        except Exception as error:  # pylint: disable=broad-except
+            result = f'error: {error!r}'
+        results.append((index, result, time.perf_counter() - started))
+    return results
+
+
+def _histogram(latencies: list) -> dict:
+    """
+    Counts the latencies falling into each HISTOGRAM_BOUNDS_MS bucket.
+    """
+    histogram = {f'<={bound}ms': 0 for bound in HISTOGRAM_BOUNDS_MS}
+    histogram[f'>{HISTOGRAM_BOUNDS_MS[-1]}ms'] = 0
+    for latency in latencies:
+        milliseconds = latency * 1000
+        for bound in HISTOGRAM_BOUNDS_MS:
+            if milliseconds <= bound:
+                histogram[f'<={bound}ms'] += 1
+                break
+        else:
+            histogram[f'>{HISTOGRAM_BOUNDS_MS[-1]}ms'] += 1
+    return histogram
+
+
+def _percentile(sorted_latencies: list, fraction: float) -> float:
+    """
+    Returns the latency at the given fraction of the sorted latencies.
+    """
+    if not sorted_latencies:
+        return 0.0
+    position = min(len(sorted_latencies) - 1,
+                   int(fraction * len(sorted_latencies)))
+    return sorted_latencies[position]
+
+
+def replay(trace_filename: str, hotel_filename: str,
+           speedup: Optional[float] = 1.0, concurrency: int = 1,
+           use_processes: bool = False) -> dict:
+    """
+    Replays a trace against a fresh copy of the hotel data.
+
+    Operations are dealt round-robin to the workers, and each worker issues
+    its operations in trace order at their recorded time divided by
+    speedup.
+
+    Parameters:
+    - trace_filename (str): The filename of the recorded trace.
+    - hotel_filename (str): The hotel data the trace was recorded against.
+    It is copied, never modified.
+    - speedup (float, optional): How many times faster than recorded to
+    issue the operations, or None to issue them as fast as possible.
+    Defaults to 1.0.
+    - concurrency (int, optional): The number of workers. Defaults to 1.
+    - use_processes (bool, optional): Whether the workers are processes
+    instead of threads. Defaults to False.
+
+    Returns:
+    A dict with the number of operations, the duration in seconds, the
+    throughput in operations per second, latency percentiles in seconds, a
+    latency histogram and the mismatching results.
+    """
+    operations = list(enumerate(load_trace(trace_filename)))
+    chunks = [operations[worker::concurrency]
+              for worker in range(concurrency)]
+    with tempfile.TemporaryDirectory() as directory:
+        replay_filename = os.path.join(directory, 'hotels.json')
+        shutil.copyfile(hotel_filename, replay_filename)
+        executor_class = (ProcessPoolExecutor if use_processes
+                          else ThreadPoolExecutor)
+        start = time.time()
+        with executor_class(max_workers=concurrency) as executor:
+            futures = [executor.submit(_replay_operations, replay_filename,
+                                       chunk, start, speedup)
+                       for chunk in chunks]
+            results = [result for future in futures
+                       for result in future.result()]
+        duration = time.time() - start
+
+    latencies = sorted(latency for _, _, latency in results)
+    mismatches = []
+    for index, result, _ in sorted(results, key=lambda item: item[0]):
+        expected = operations[index][1]['result']
+        if result != expected:
+            mismatches.append({
+                'index': index,
+                'method': operations[index][1]['method'],
+                'expected': expected,
+                'actual': result
+            })
+    return {
+        'operations': len(results),
+        'duration': duration,
+        'throughput': len(results) / duration if duration else 0.0,
+        'latency': {
+            'p50': _percentile(latencies, 0.5),
+            'p90': _percentile(latencies, 0.9),
+            'p99': _percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else 0.0
+        },
+        'histogram': _histogram(latencies),
+        'mismatches': mismatches
+    }
+
+
+def main():
+    """
+    Runs the replay tool from the command line and prints its report.
+    """
+    parser = argparse.ArgumentParser(
+        description='Replay a recorded trace against a copy of hotel data.')
+    parser.add_argument('trace', help='the recorded trace file')
+    parser.add_argument('hotels', help='the hotel data the trace started on')
+    parser.add_argument('--speedup', type=float, default=1.0,
+                        help='replay speed-up; 0 replays without pacing')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='number of workers')
+    parser.add_argument('--processes', action='store_true',
+                        help='use processes instead of threads')
+    arguments = parser.parse_args()
+    report = replay(arguments.trace, arguments.hotels,
+                    arguments.speedup or None, arguments.concurrency,
+                    arguments.processes)
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+This module contains the tests for the TraceRecorder class and the replay
+function.
+"""
+import json
+import shutil
+import time
+import unittest
+from customer import Customer
+from hotel import Hotel
+from reservation import Reservation
+from testing_utils import TemporaryDirectoryTestCase
+from tracing import TraceRecorder, load_trace, replay
+
+
+class TestTracing(TemporaryDirectoryTestCase):
+    """
+    A class to test recording a trace and replaying it.
+    """
+
+    def setUp(self):
+        """
+        Records a trace of operations made on a copy of a base data file.
+        """
+        super().setUp()
+        self.base_filename = self.path('base.json')
+        hotel_filename = self.path('hotels.json')
+        self.trace_filename = self.path('trace.jsonl')
+        Hotel(self.base_filename).create_hotel('Test Hotel', 'City Center',
+                                               {'single': 5, 'double': 2})
+        shutil.copyfile(self.base_filename, hotel_filename)
+
+        recorder = TraceRecorder(self.trace_filename)
+        hotel = recorder.wrap(Hotel(hotel_filename))
+        customer = recorder.wrap(Customer(hotel_filename))
+        reservation = recorder.wrap(Reservation(hotel_filename))
+        customer.create_customer('Test Hotel', 'Jane Smith')
+        hotel.reserve_room('Test Hotel', 'John Doe', '2024-02-20', 'double')
+        reservation.create_reservation('Test Hotel', 'Jane Smith',
+                                       '2024-02-21', room_type='double')
+        reservation.cancel_reservation('Test Hotel', 'John Doe')
+        customer.display_customer_info('Test Hotel', 'Jane Smith')
+        hotel.display_hotel_info('Test Hotel')
+
+    def test_records_public_calls(self):
+        """
+        Tests that every public call is recorded with its arguments.
+        """
+        operations = load_trace(self.trace_filename)
+        self.assertEqual([operation['method'] for operation in operations],
+                         ['create_customer', 'reserve_room',
+                          'create_reservation', 'cancel_reservation',
+                          'display_customer_info', 'display_hotel_info'])
+        self.assertEqual(operations[2]['kwargs'], {'room_type': 'double'})
+        self.assertEqual(operations[0]['result'],
+                         'Customer Jane Smith created for Test Hotel')
+
+    def test_offsets_start_at_first_call(self):
+        """
+        Tests that idle time between creating the recorder and the first
+        call is not part of the recorded offsets.
+        """
+        trace_filename = self.path('idle.jsonl')
+        recorder = TraceRecorder(trace_filename)
+        hotel = recorder.wrap(Hotel(self.base_filename))
+        time.sleep(0.2)
+        hotel.display_hotel_info('Test Hotel')
+        hotel.display_hotel_info('Test Hotel')
+        offsets = [operation['offset']
+                   for operation in load_trace(trace_filename)]
+        self.assertEqual(offsets[0], 0.0)
+        self.assertLess(offsets[1], 0.1)
+
+    def test_records_raising_calls(self):
+        """
+        Tests that a call that raises is recorded and still raises.
+        """
+        recorder = TraceRecorder(self.trace_filename)
+        hotel = recorder.wrap(Hotel(self.base_filename))
+        with self.assertRaises(TypeError):
+            hotel.create_hotel('Broken Hotel')
+        operation = load_trace(self.trace_filename)[-1]
+        self.assertEqual(operation['method'], 'create_hotel')
+        self.assertTrue(operation['result'].startswith('error: TypeError'))
+
+    def test_unserializable_calls_do_not_raise(self):
+        """
+        Tests that arguments that cannot be serialized never reach the
+        caller as errors.
+        """
+        recorder = TraceRecorder(self.trace_filename)
+        hotel = recorder.wrap(Hotel(self.base_filename))
+        self.assertEqual(hotel.reserve_room('Test Hotel', object(),
+                                            '2024-02-20'),
+                         'Invalid customer name.')
+        self.assertTrue(load_trace(self.trace_filename)[-1]['args'][1]
+                        .startswith('<object object'))
+        circular = []
+        circular.append(circular)
+        self.assertEqual(hotel.display_hotel_info(circular),
+                         'Hotel not found')
+        self.assertEqual(recorder.dropped, 1)
+
+    def test_sequential_replay_matches(self):
+        """
+        Tests that a sequential replay reproduces every recorded result.
+        """
+        report = replay(self.trace_filename, self.base_filename,
+                        speedup=None)
+        self.assertEqual(report['operations'], 6)
+        self.assertEqual(report['mismatches'], [])
+        self.assertEqual(sum(report['histogram'].values()), 6)
+        self.assertGreater(report['throughput'], 0)
+
+    def test_replay_reports_mismatches(self):
+        """
+        Tests that results differing from the trace are reported.
+        """
+        with open(self.base_filename, 'w', encoding='UTF-8') as file:
+            json.dump([], file)
+        report = replay(self.trace_filename, self.base_filename,
+                        speedup=None)
+        self.assertEqual(len(report['mismatches']), 6)
+        self.assertEqual(report['mismatches'][0]['expected'],
+                         'Customer Jane Smith created for Test Hotel')
+
+    def test_concurrent_replay_in_processes(self):
+        """
+        Tests that a replay spread over processes issues every operation.
+        """
+        report = replay(self.trace_filename, self.base_filename,
+                        speedup=100, concurrency=2, use_processes=True)
+        self.assertEqual(report['operations'], 6)
+        self.assertEqual(sum(report['histogram'].values()), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()